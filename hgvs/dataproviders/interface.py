@@ -11,6 +11,7 @@ import hgvs
 
 from ..decorators.lru_cache import lru_cache, LEARN, RUN, VERIFY
 from ..utils.PersistentDict import PersistentDict
+from .seqcache import SeqCache
 
 
 class Interface(object):
@@ -68,7 +69,14 @@ class Interface(object):
         self.get_acs_for_protein_seq = lru_cache(maxsize=hgvs.global_config.lru_cache.maxsize, mode=self.mode, cache=self.cache)(self.get_acs_for_protein_seq)
         self.get_gene_info           = lru_cache(maxsize=hgvs.global_config.lru_cache.maxsize, mode=self.mode, cache=self.cache)(self.get_gene_info)
         self.get_pro_ac_for_tx_ac    = lru_cache(maxsize=hgvs.global_config.lru_cache.maxsize, mode=self.mode, cache=self.cache)(self.get_pro_ac_for_tx_ac)
-        self.get_seq                 = lru_cache(maxsize=hgvs.global_config.lru_cache.maxsize, mode=self.mode, cache=self.cache)(self.get_seq)
+        if self.mode is None:
+            # persistent caches (learn, run, verify) record exact requests, so blocks are used only without one
+            self.seq_cache = SeqCache(self.get_seq)
+            self.get_seq = self.seq_cache.get_seq
+        else:
+            self.seq_cache = None
+            self.get_seq = lru_cache(maxsize=hgvs.global_config.lru_cache.maxsize, mode=self.mode,
+                                     cache=self.cache)(self.get_seq)
         self.get_similar_transcripts = lru_cache(maxsize=hgvs.global_config.lru_cache.maxsize, mode=self.mode, cache=self.cache)(self.get_similar_transcripts)
         self.get_tx_exons            = lru_cache(maxsize=hgvs.global_config.lru_cache.maxsize, mode=self.mode, cache=self.cache)(self.get_tx_exons)
         self.get_tx_for_gene         = lru_cache(maxsize=hgvs.global_config.lru_cache.maxsize, mode=self.mode, cache=self.cache)(self.get_tx_for_gene)
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""Sequence cache for data providers
+
+SeqCache wraps a sequence fetching function, fetch(ac, start_i=None,
+end_i=None), with a cache that serves any slice of a sequence from
+cached pieces:
+
+* genomic sequences (e.g., NC_000007.13) are fetched in blocks of
+  block_size bases, aligned on multiples of block_size, so that nearby
+  requests share blocks
+* other sequences (transcripts and proteins, e.g., NM_000059.3) are
+  fetched whole
+
+Pieces are evicted in least-recently-used order to keep the total
+length of cached sequence within max_bytes.  Requests and hits are
+reported by cache_info().
+
+>>> fetched = []
+>>> def fetch(ac, start_i=None, end_i=None):
+...     fetched.append((ac, start_i, end_i))
+...     return ("ACGT" * 100)[start_i:end_i]
+>>> sc = SeqCache(fetch, block_size=100, max_bytes=1000)
+>>> print(sc.get_seq("NC_000001.10", 90, 105))
+GTACGTACGTACGTA
+>>> print(sc.get_seq("NC_000001.10", 95, 98))
+TAC
+>>> fetched
+[(u'NC_000001.10', 0, 100), (u'NC_000001.10', 100, 200)]
+>>> sc.cache_info()
+SeqCacheInfo(hits=1, misses=1, maxbytes=1000, currbytes=200)
+
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+from collections import namedtuple, OrderedDict
+import re
+from threading import RLock
+
+import hgvs
+
+# accessions of sequences that are fetched in blocks rather than whole
+genomic_ac_re = re.compile(r"^(?:AC|NC|NG|NT|NW)_|^[A-Z]{1,2}\d{5,6}\.\d+$")
+
+
+class SeqCacheInfo(namedtuple("SeqCacheInfo", ["hits", "misses", "maxbytes", "currbytes"])):
+    @property
+    def hit_ratio(self):
+        """fraction of requests served entirely from the cache"""
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+
+class SeqCache(object):
+    """block-aligned sequence cache; see module docstring"""
+
+    def __init__(self, fetch, block_size=None, max_bytes=None):
+        """
+        :param fetch: function(ac, start_i=None, end_i=None) returning a sequence
+        :param int block_size: length of blocks fetched for genomic sequences
+        :param int max_bytes: maximum total length of cached sequence
+        """
+        if block_size is None:
+            block_size = hgvs.global_config.sequence_cache.block_size
+        if max_bytes is None:
+            max_bytes = hgvs.global_config.sequence_cache.max_bytes
+        self.fetch = fetch
+        self.block_size = int(block_size)
+        self.max_bytes = int(max_bytes)
+        self._pieces = OrderedDict()    # (ac, block index or None for whole sequence) -> sequence
+        self._bytes = 0
+        self._hits = self._misses = 0
+        self._lock = RLock()
+
+    def get_seq(self, ac, start_i=None, end_i=None):
+        """return the sequence of ac for the interbase interval
+        [start_i, end_i), or the whole sequence if either is None
+
+        Genomic requests with only one of start_i and end_i are passed
+        to fetch uncached, rather than fetching the whole chromosome.
+        """
+        genomic = genomic_ac_re.match(ac)
+        if genomic and (start_i is None) != (end_i is None):
+            self._count(False)
+            return self.fetch(ac, start_i, end_i)
+        if start_i is None or end_i is None or not genomic:
+            seq, hit = self._get_piece(ac, None)
+            self._count(hit)
+            return seq if (start_i is None or end_i is None) else seq[start_i:end_i]
+        whole = self._lookup((ac, None))
+        if whole is not None or end_i <= start_i:
+            self._count(True)
+            return (whole or "")[start_i:end_i]
+        first_block, last_block = start_i // self.block_size, (end_i - 1) // self.block_size
+        pieces = [self._get_piece(ac, i) for i in range(first_block, last_block + 1)]
+        self._count(all(hit for _, hit in pieces))
+        offset = first_block * self.block_size
+        return "".join(seq for seq, _ in pieces)[start_i - offset:end_i - offset]
+
+    def cache_info(self):
+        with self._lock:
+            return SeqCacheInfo(self._hits, self._misses, self.max_bytes, self._bytes)
+
+    def cache_clear(self):
+        with self._lock:
+            self._pieces.clear()
+            self._bytes = 0
+            self._hits = self._misses = 0
+
+    def _lookup(self, key):
+        with self._lock:
+            seq = self._pieces.pop(key, None)
+            if seq is not None:
+                self._pieces[key] = seq    # most recently used
+            return seq
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+    def _get_piece(self, ac, block):
+        """return (sequence, whether it was cached) for a block, or for
+        the whole sequence if block is None"""
+        key = (ac, block)
+        seq = self._lookup(key)
+        if seq is not None:
+            return seq, True
+        if block is None:
+            seq = self.fetch(ac)
+        else:
+            seq = self.fetch(ac, block * self.block_size, (block + 1) * self.block_size)
+        with self._lock:
+            if len(seq) <= self.max_bytes and key not in self._pieces:
+                self._pieces[key] = seq
+                self._bytes += len(seq)
+                while self._bytes > self.max_bytes:
+                    _, evicted = self._pieces.popitem(last=False)
+                    self._bytes -= len(evicted)
+        return seq, False
+
+# <LICENSE>
+# Copyright 2013-2015 HGVS Contributors (https://bitbucket.org/biocommons/hgvs)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# </LICENSE>
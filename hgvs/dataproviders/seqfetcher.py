@@ -9,8 +9,6 @@ import logging
 import os
 import re
 
-import requests
-
 from ..exceptions import HGVSDataNotAvailableError
 
 logger = logging.getLogger(__name__)
@@ -74,6 +72,8 @@ class SeqFetcher(object):
 
         """
 
+        import requests
+
         url_fmt = "http://rest.ensembl.org/sequence/id/{ac}"
         url = url_fmt.format(ac=ac)
         r = requests.get(url, headers={"Content-Type": "application/json"})
@@ -107,6 +107,8 @@ class SeqFetcher(object):
 
         """
 
+        import requests
+
         url_fmt = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi?db=nucleotide&id={ac}&rettype=fasta"
         if (start_i is None or end_i is None):
             url = url_fmt.format(ac=ac)
@@ -180,6 +182,8 @@ class SeqFetcher(object):
 
         """
 
+        import requests
+
         _ac_dispatch = [
             {'re': re.compile('^(?:AC|N[CGMPRTW])_|^[A-L]\w\d|^U\d'),
              'fetcher': self._fetch_seq_ncbi},
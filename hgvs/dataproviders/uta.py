@@ -13,10 +13,6 @@ import re
 import sqlite3
 import urlparse
 
-import psycopg2
-import psycopg2.extras
-import psycopg2.pool
-
 from bioutils.assemblies import make_ac_name_map
 from bioutils.digests import seq_md5
 
@@ -477,6 +473,9 @@ class UTA_postgresql(UTABase):
         super(UTA_postgresql, self).__init__(url, mode, cache)
 
     def _connect(self):
+        import psycopg2
+        import psycopg2.pool
+
         if self.application_name is None:
             st = inspect.stack()
             self.application_name = os.path.basename(st[-1][1])
@@ -517,6 +516,8 @@ class UTA_postgresql(UTABase):
 
         """
 
+        import psycopg2.extras
+
         conn = self._pool.getconn() if self.pooling else self._conn
 
         # setting autocommit obviates explicitly closing the
@@ -16,10 +16,13 @@ import recordtype
 from bioutils.sequences import aa_to_aa1, aa1_to_aa3
 
 import hgvs
+import hgvs.utils
 from hgvs.exceptions import HGVSError, HGVSUnsupportedOperationError
 
 
-class Edit(object):
+class Edit(hgvs.utils.CloneMixin):
+    __slots__ = ()
+
     def format(self, conf=None):
         return str(self)
 
@@ -45,6 +48,8 @@ class NARefAlt(Edit, recordtype.recordtype("NARefAlt", [("ref", None), ("alt", N
     :ivar uncertain: boolean indicating whether the variant is uncertain/undetermined
     """
 
+    __slots__ = ()
+
     def __init__(self, ref=None, alt=None, uncertain=False, edit=None):
         if edit:
             ref = edit.ref
@@ -144,6 +149,8 @@ class NARefAlt(Edit, recordtype.recordtype("NARefAlt", [("ref", None), ("alt", N
 
 
 class AARefAlt(Edit, recordtype.recordtype("AARefAlt", [("ref", None), ("alt", None), ("uncertain", False)])):
+    __slots__ = ()
+
     def __init__(self, ref, alt, uncertain=False):
         super(AARefAlt, self).__init__(ref=aa_to_aa1(ref), alt=aa_to_aa1(alt), uncertain=uncertain)
 
@@ -235,6 +242,8 @@ class AARefAlt(Edit, recordtype.recordtype("AARefAlt", [("ref", None), ("alt", N
 
 
 class AASub(AARefAlt):
+    __slots__ = ()
+
     def format(self, conf=None):
         p_3_letter, p_term_asterisk = self._format_config(conf)
         
@@ -258,6 +267,8 @@ class AASub(AARefAlt):
 
 
 class AAFs(Edit, recordtype.recordtype("AAFs", [("ref", None), ("alt", None), ("length", None), ("uncertain", False)])):
+    __slots__ = ()
+
     def __init__(self, ref, alt, length=None, uncertain=False):
         super(AAFs, self).__init__(ref=aa_to_aa1(ref), alt=aa_to_aa1(alt), length=length, uncertain=uncertain)
 
@@ -295,6 +306,8 @@ class AAFs(Edit, recordtype.recordtype("AAFs", [("ref", None), ("alt", None), ("
 
 class AAExt(Edit, recordtype.recordtype("AAExt", [("ref", None), ("alt", None), ("aaterm", None), ("length", None),
                                                   ("uncertain", False)])):
+    __slots__ = ()
+
     def __init__(self, ref, alt, aaterm=None, length=None, uncertain=False):
         super(AAExt, self).__init__(ref=aa_to_aa1(ref),
                                     alt=aa_to_aa1(alt),
@@ -346,6 +359,8 @@ class AAExt(Edit, recordtype.recordtype("AAExt", [("ref", None), ("alt", None),
 
 
 class Dup(Edit, recordtype.recordtype('Dup', [('ref', None), ('uncertain', False)])):
+    __slots__ = ()
+
     def __init__(self, ref=None, uncertain=False, edit=None):
         if edit:
             ref = edit.ref
@@ -390,6 +405,8 @@ class Dup(Edit, recordtype.recordtype('Dup', [('ref', None), ('uncertain', False
 
 class Repeat(Edit, recordtype.recordtype('Repeat', [('ref', None), ('min', None), ('max', None),
                                                     ('uncertain', False)])):
+    __slots__ = ()
+
     def __str__(self):
         if self.min > self.max:
             raise HGVSError("Repeat min count must be less than or equal to max count")
@@ -424,6 +441,8 @@ class NACopy(Edit, recordtype.recordtype("NACopy", ["copy", ("uncertain", False)
 
     """
 
+    __slots__ = ()
+
     def __str__(self):
         s = "copy{}".format(self.copy)
         return "(" + s + ")" if self.uncertain else s
@@ -456,6 +475,8 @@ class Inv(Edit, recordtype.recordtype('Inv', [('ref', None), ('uncertain', False
     """Inversion
     """
 
+    __slots__ = ()
+
     def __init__(self, ref=None, uncertain=False, edit=None):
         if edit:
             ref = edit.ref
@@ -508,6 +529,8 @@ class Conv(Edit, recordtype.recordtype('Conv', [('from_ac', None), ('from_type',
     """Conversion
     """
 
+    __slots__ = ()
+
     def __init__(self, from_ac=None, from_type=None, from_pos=None, uncertain=False, edit=None):
         if edit:
             from_ac = edit.from_ac
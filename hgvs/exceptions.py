@@ -32,7 +32,22 @@ class HGVSNormalizationError(HGVSError):
 
 
 class HGVSParseError(HGVSError):
-    pass
+    """Exception raised when a string cannot be parsed
+
+    When raised by the parser, `s` is the input string, `position` is
+    the character offset at which parsing failed, and `reason` is the
+    parser's explanation of the failure.
+    """
+
+    def __init__(self, message=None, s=None, position=None, reason=None):
+        super(HGVSParseError, self).__init__(message)
+        self.s = s
+        self.position = position
+        self.reason = reason
+
+    def __reduce__(self):
+        # keep the structured attributes when pickled (e.g., returned from worker processes)
+        return (self.__class__, (self.args[0] if self.args else None, self.s, self.position, self.reason))
 
 
 class HGVSUnsupportedOperationError(HGVSError):
@@ -7,8 +7,10 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 import recordtype
 
+import hgvs.utils
 
-class HGVSPosition(recordtype.recordtype("HGVSPosition", ["ac", "type", "pos"])):
+
+class HGVSPosition(hgvs.utils.CloneMixin, recordtype.recordtype("HGVSPosition", ["ac", "type", "pos"])):
     """
     HGVSPosition -- Represent partial HGVS tags that refer to a position without alleles
 
@@ -18,6 +20,8 @@ class HGVSPosition(recordtype.recordtype("HGVSPosition", ["ac", "type", "pos"]))
 
     """
 
+    __slots__ = ()
+
     def __str__(self):
         return "{self.ac}:{self.type}.{self.pos}".format(self=self)
 
@@ -44,6 +44,9 @@ start_i and minimal end_i.
 
 from __future__ import absolute_import, division, print_function, unicode_literals
 
+import array
+import bisect
+import itertools
 import re
 
 from hgvs.exceptions import HGVSInvalidIntervalError
@@ -89,8 +92,14 @@ class IntervalPair(object):
 
 class IntervalMapper(object):
     """Provides mapping between sequence coordinates according to an
-    ordered set of IntervalPairs."""
-    __slots__ = ("interval_pairs", "ref_intervals", "tgt_intervals", "ref_len", "tgt_len")
+    ordered set of IntervalPairs.
+
+    The alignment is stored as four tables of segment start and end
+    coordinates (ref_starts, ref_ends, tgt_starts, tgt_ends); the
+    IntervalPair objects are built only if interval_pairs is used.
+    """
+    __slots__ = ("ref_starts", "ref_ends", "tgt_starts", "tgt_ends", "ref_len", "tgt_len", "_interval_pairs",
+                 "_arrays")
 
     def __init__(self, interval_pairs):
         """
@@ -106,13 +115,39 @@ class IntervalMapper(object):
                 # of Intervals, guarantees that intervals are ordered
                 assert ivs[i - 1].end_i == ivs[i].start_i, "intervals must be adjacent"
 
-        self.interval_pairs = interval_pairs
-        self.ref_intervals = [ip.ref for ip in self.interval_pairs]
-        self.tgt_intervals = [ip.tgt for ip in self.interval_pairs]
-        _validate_intervals(self.ref_intervals)
-        _validate_intervals(self.tgt_intervals)
-        self.ref_len = sum([iv.len for iv in self.ref_intervals])
-        self.tgt_len = sum([iv.len for iv in self.tgt_intervals])
+        _validate_intervals([ip.ref for ip in interval_pairs])
+        _validate_intervals([ip.tgt for ip in interval_pairs])
+        self._set_tables([ip.ref.start_i for ip in interval_pairs], [ip.ref.end_i for ip in interval_pairs],
+                         [ip.tgt.start_i for ip in interval_pairs], [ip.tgt.end_i for ip in interval_pairs])
+        self._interval_pairs = interval_pairs
+
+    def _set_tables(self, ref_starts, ref_ends, tgt_starts, tgt_ends):
+        # adjacency means that starts and ends are both non-decreasing,
+        # which permits bisection in _map
+        self.ref_starts = array.array(str("l"), ref_starts)
+        self.ref_ends = array.array(str("l"), ref_ends)
+        self.tgt_starts = array.array(str("l"), tgt_starts)
+        self.tgt_ends = array.array(str("l"), tgt_ends)
+        self.ref_len = sum(self.ref_ends) - sum(self.ref_starts)
+        self.tgt_len = sum(self.tgt_ends) - sum(self.tgt_starts)
+        self._interval_pairs = None
+        self._arrays = None
+
+    @property
+    def interval_pairs(self):
+        if self._interval_pairs is None:
+            self._interval_pairs = [IntervalPair(Interval(ref_s, ref_e), Interval(tgt_s, tgt_e))
+                                    for ref_s, ref_e, tgt_s, tgt_e in zip(self.ref_starts, self.ref_ends,
+                                                                          self.tgt_starts, self.tgt_ends)]
+        return self._interval_pairs
+
+    @property
+    def ref_intervals(self):
+        return [ip.ref for ip in self.interval_pairs]
+
+    @property
+    def tgt_intervals(self):
+        return [ip.tgt for ip in self.interval_pairs]
 
     @staticmethod
     def from_cigar(cigar):
@@ -123,38 +158,139 @@ class IntervalMapper(object):
         """
         return IntervalMapper(cigar_to_intervalpairs(cigar))
 
+    @staticmethod
+    def from_tx_exons(exons, strand):
+        """
+        :param exons: exon records (from hdp.get_tx_exons), in transcript order
+        :param strand: alignment strand (1 or -1)
+        :returns: an IntervalMapper instance equivalent to
+            IntervalMapper.from_cigar(hgvs.utils.build_tx_cigar(exons, strand))
+
+        The segment tables are built directly from the exon records,
+        without building and reparsing a transcript CIGAR string.
+        Parsed exon CIGARs are cached (see _cigar_segment_lens).
+        """
+        ref_starts, ref_ends, tgt_starts, tgt_ends = [], [], [], []
+        ref_pos = tgt_pos = 0
+        for i, exon in enumerate(exons):
+            seg_lens = _cigar_segment_lens(exon["cigar"])
+            if strand == -1:
+                seg_lens = reversed(seg_lens)
+            if i > 0:
+                # intron, as N
+                seg_lens = itertools.chain([(exon["alt_start_i"] - exons[i - 1]["alt_end_i"], 0)], seg_lens)
+            for ref_len, tgt_len in seg_lens:
+                ref_starts.append(ref_pos)
+                tgt_starts.append(tgt_pos)
+                ref_pos += ref_len
+                tgt_pos += tgt_len
+                ref_ends.append(ref_pos)
+                tgt_ends.append(tgt_pos)
+        im = IntervalMapper.__new__(IntervalMapper)
+        im._set_tables(ref_starts, ref_ends, tgt_starts, tgt_ends)
+        return im
+
     def map_ref_to_tgt(self, start_i, end_i, max_extent=False):
-        return self._map(self.ref_intervals, self.tgt_intervals, start_i, end_i, max_extent)
+        return self._map(self.ref_starts, self.ref_ends, self.tgt_starts, self.tgt_ends, start_i, end_i, max_extent)
 
     def map_tgt_to_ref(self, start_i, end_i, max_extent=False):
-        return self._map(self.tgt_intervals, self.ref_intervals, start_i, end_i, max_extent)
+        return self._map(self.tgt_starts, self.tgt_ends, self.ref_starts, self.ref_ends, start_i, end_i, max_extent)
+
+    def map_ref_to_tgt_array(self, starts, ends, max_extent=False):
+        """map arrays of ref intervals to tgt intervals; equivalent to
+        calling map_ref_to_tgt on each (start_i, end_i) pair
+
+        :param starts: array-like of interval start_i values
+        :param ends: array-like of interval end_i values, same length as starts
+        :returns: tuple of two numpy arrays (tgt start_i values, tgt end_i values)
+        :raises HGVSInvalidIntervalError: if any interval is out of bounds
+
+        Requires numpy.
+        """
+        ref, tgt = self._get_arrays()
+        return self._map_array(ref, tgt, starts, ends, max_extent)
+
+    def map_tgt_to_ref_array(self, starts, ends, max_extent=False):
+        """map arrays of tgt intervals to ref intervals; equivalent to
+        calling map_tgt_to_ref on each (start_i, end_i) pair
+
+        See map_ref_to_tgt_array.
+        """
+        ref, tgt = self._get_arrays()
+        return self._map_array(tgt, ref, starts, ends, max_extent)
+
+    def _get_arrays(self):
+        """returns (starts, ends) numpy arrays for ref and tgt, built on first use"""
+        if self._arrays is None:
+            import numpy as np
+            self._arrays = ((np.array(self.ref_starts, dtype=np.int64), np.array(self.ref_ends, dtype=np.int64)),
+                            (np.array(self.tgt_starts, dtype=np.int64), np.array(self.tgt_ends, dtype=np.int64)))
+        return self._arrays
 
     @staticmethod
-    def _map(from_ivs, to_ivs, from_start_i, from_end_i, max_extent):
-        def iv_map(from_ivs, to_ivs, from_start_i, from_end_i, max_extent):
-            """returns the <start,end> intervals indexes in which from_start_i and from_end_i occur"""
+    def _map_array(from_arrays, to_arrays, starts, ends, max_extent):
+        """vectorized form of _map; see iv_map there for the logic"""
+        import numpy as np
+        from_starts, from_ends = from_arrays
+        to_starts, to_ends = to_arrays
+        s = np.asarray(starts, dtype=np.int64)
+        e = np.asarray(ends, dtype=np.int64)
+        if s.shape != e.shape:
+            raise HGVSInvalidIntervalError("starts and ends must have the same shape")
+        if np.any(s > e):
+            raise HGVSInvalidIntervalError("expected start_i <= end_i for all intervals")
+        if len(from_ends) == 0 and s.size:
+            raise HGVSInvalidIntervalError("start or end or both are beyond the bounds of transcript record")
+
+        # exact match: bisection restricted to [lo, hi) in a sorted
+        # array equals the unrestricted bisection clipped to [lo, hi]
+        lo = np.searchsorted(from_starts, s, side="left")
+        hi = np.searchsorted(from_starts, s, side="right")
+        i = np.clip(np.searchsorted(from_ends, e, side="left"), lo, hi)
+        exact = (i < hi) & (from_ends[np.minimum(i, len(from_ends) - 1)] == e)
+
+        s_first, s_last = np.searchsorted(from_ends, s, side="left"), hi - 1
+        e_first, e_last = np.searchsorted(from_ends, e, side="left"), np.searchsorted(from_starts, e, side="right") - 1
+        if np.any(~exact & ((s_first > s_last) | (e_first > e_last))):
+            raise HGVSInvalidIntervalError("start or end or both are beyond the bounds of transcript record")
+        si = np.where(exact, i, s_first if max_extent else s_last)
+        ei = np.where(exact, i, e_last if max_extent else e_first)
+
+        to_start_i = np.clip(to_starts[si] + (s - from_starts[si]), to_starts[si], to_ends[si])
+        to_end_i = np.clip(to_ends[ei] - (from_ends[ei] - e), to_starts[ei], to_ends[ei])
+        return to_start_i, to_end_i
+
+    @staticmethod
+    def _map(from_starts, from_ends, to_starts, to_ends, from_start_i, from_end_i, max_extent):
+        def iv_map(from_starts, from_ends, from_start_i, from_end_i, max_extent):
+            """returns the <start,end> intervals indexes in which from_start_i and from_end_i occur
+
+            The intervals containing a position p are contiguous: from
+            the first with end_i >= p through the last with start_i <= p.
+            """
             # first look for 0-width interval that matches
-            seil = [i for i, iv in enumerate(from_ivs) if iv.start_i == from_start_i and iv.end_i == from_end_i]
-            if len(seil) > 0:
-                si = ei = seil[0]
-            else:
-                sil = [i for i, iv in enumerate(from_ivs) if iv.start_i <= from_start_i <= iv.end_i]
-                eil = [i for i, iv in enumerate(from_ivs) if iv.start_i <= from_end_i <= iv.end_i]
-                if len(sil) == 0 or len(eil) == 0:
-                    raise HGVSInvalidIntervalError("start or end or both are beyond the bounds of transcript record")
-                si, ei = (sil[0], eil[-1]) if max_extent else (sil[-1], eil[0])
-            return si, ei
-
-        def clip_to_iv(iv, pos):
-            return max(iv.start_i, min(iv.end_i, pos))
+            lo = bisect.bisect_left(from_starts, from_start_i)
+            hi = bisect.bisect_right(from_starts, from_start_i, lo)
+            i = bisect.bisect_left(from_ends, from_end_i, lo, hi)
+            if i < hi and from_ends[i] == from_end_i:
+                return i, i
+            s_first, s_last = bisect.bisect_left(from_ends, from_start_i), hi - 1
+            e_first = bisect.bisect_left(from_ends, from_end_i)
+            e_last = bisect.bisect_right(from_starts, from_end_i) - 1
+            if s_first > s_last or e_first > e_last:
+                raise HGVSInvalidIntervalError("start or end or both are beyond the bounds of transcript record")
+            return (s_first, e_last) if max_extent else (s_last, e_first)
+
+        def clip_to_iv(i, pos):
+            return max(to_starts[i], min(to_ends[i], pos))
 
         assert from_start_i <= from_end_i, "expected from_start_i <= from_end_i"
         try:
-            si, ei = iv_map(from_ivs, to_ivs, from_start_i, from_end_i, max_extent)
+            si, ei = iv_map(from_starts, from_ends, from_start_i, from_end_i, max_extent)
         except ValueError:
             raise HGVSInvalidIntervalError("start_i,end_i interval out of bounds")
-        to_start_i = clip_to_iv(to_ivs[si], to_ivs[si].start_i + (from_start_i - from_ivs[si].start_i))
-        to_end_i = clip_to_iv(to_ivs[ei], to_ivs[ei].end_i - (from_ivs[ei].end_i - from_end_i))
+        to_start_i = clip_to_iv(si, to_starts[si] + (from_start_i - from_starts[si]))
+        to_end_i = clip_to_iv(ei, to_ends[ei] - (from_ends[ei] - from_end_i))
         return to_start_i, to_end_i
 
 
@@ -180,6 +316,31 @@ class CIGARElement(object):
         return self.len if self.op in "=DX" else 0
 
 
+_cigar_elem_re = re.compile("(?P<len>\d+)(?P<op>[=DIMNX])")
+
+
+# exon CIGARs recur often (most are just "<n>="), so parsed CIGARs are
+# kept in a plain dict, which is much cheaper per lookup than
+# lru_cache; it is emptied when full
+_cigar_segment_lens_cache = {}
+_cigar_segment_lens_cache_maxsize = 10000
+
+
+def _cigar_segment_lens(cigar):
+    """returns a tuple of (ref_len, tgt_len) pairs, one per CIGAR
+    operation"""
+    try:
+        return _cigar_segment_lens_cache[cigar]
+    except KeyError:
+        pass
+    seg_lens = tuple((ce.ref_len, ce.tgt_len) for ce in (CIGARElement(op=m.group("op"), len=int(m.group("len")))
+                                                         for m in _cigar_elem_re.finditer(cigar)))
+    if len(_cigar_segment_lens_cache) >= _cigar_segment_lens_cache_maxsize:
+        _cigar_segment_lens_cache.clear()
+    _cigar_segment_lens_cache[cigar] = seg_lens
+    return seg_lens
+
+
 def cigar_to_intervalpairs(cigar):
     """For a given CIGAR string, return a list of (Interval,Interval)
     pairs.  The length of the returned list will be equal to the
@@ -23,6 +23,7 @@ from functools import total_ordering
 from bioutils.sequences import aa1_to_aa3
 
 import hgvs
+import hgvs.utils
 from hgvs.exceptions import HGVSError, HGVSUnsupportedOperationError, HGVSInvalidIntervalError
 
 
@@ -32,7 +33,10 @@ CDS_END = 2
 
 
 @total_ordering
-class SimplePosition(recordtype.recordtype("SimplePosition", field_names=[("base", None), ("uncertain", False)])):
+class SimplePosition(hgvs.utils.CloneMixin,
+                     recordtype.recordtype("SimplePosition", field_names=[("base", None), ("uncertain", False)])):
+    __slots__ = ()
+
     def __str__(self):
         self.validate()
         s = "?" if self.base is None else str(self.base)
@@ -74,7 +78,7 @@ class SimplePosition(recordtype.recordtype("SimplePosition", field_names=[("base
 
 
 @total_ordering
-class BaseOffsetPosition(recordtype.recordtype(
+class BaseOffsetPosition(hgvs.utils.CloneMixin, recordtype.recordtype(
     'BaseOffsetPosition',
     field_names=[('base', None), ('offset', 0), ('datum', SEQ_START), ('uncertain', False)])):
     """
@@ -110,6 +114,8 @@ class BaseOffsetPosition(recordtype.recordtype(
     +----------+------------+-------+---------+------------------------------------------+
     """
 
+    __slots__ = ()
+
     def validate(self):
         "raise AssertionError if instance variables are invalid; otherwise return True"
         assert self.base is None or self.base != 0, "BaseOffsetPosition base may not be 0"
@@ -180,7 +186,10 @@ class BaseOffsetPosition(recordtype.recordtype(
 
 
 
-class AAPosition(recordtype.recordtype("AAPosition", field_names=[("base", None), ("aa", None), ("uncertain", False)])):
+class AAPosition(hgvs.utils.CloneMixin,
+                 recordtype.recordtype("AAPosition", field_names=[("base", None), ("aa", None), ("uncertain", False)])):
+    __slots__ = ()
+
     def validate(self):
         "raise AssertionError if instance variables are invalid; otherwise return True"
         assert self.base is None or self.base >= 1, "AAPosition location must be >=1"
@@ -241,7 +250,19 @@ class AAPosition(recordtype.recordtype("AAPosition", field_names=[("base", None)
         return lhs.base > rhs.base
 
 
-class Interval(recordtype.recordtype("Interval", field_names=["start", ("end", None), ("uncertain", False)])):
+class Interval(hgvs.utils.CloneMixin,
+               recordtype.recordtype("Interval", field_names=["start", ("end", None), ("uncertain", False)])):
+    __slots__ = ()
+
+    def clone(self):
+        """return a copy of this interval and its positions; as with
+        copy.deepcopy, a position used as both start and end remains
+        shared by the copy"""
+        obj = super(Interval, self).clone()
+        if self.end is self.start:
+            obj.end = obj.start
+        return obj
+
     def validate(self):
         "raise AssertionError if instance variables are invalid; otherwise return True"
         return True
@@ -275,6 +296,9 @@ class BaseOffsetInterval(Interval):
     of end and start are compatible.
 
     """
+
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super(BaseOffsetInterval, self).__init__(*args, **kwargs)
 
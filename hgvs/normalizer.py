@@ -4,7 +4,7 @@
 
 from __future__ import absolute_import, division, print_function, unicode_literals
 
-import copy
+import bisect
 import logging
 
 from bioutils.sequences import reverse_complement
@@ -12,6 +12,7 @@ from bioutils.sequences import reverse_complement
 import hgvs
 import hgvs.validator
 import hgvs.variantmapper
+from hgvs.decorators.lru_cache import lru_cache
 from hgvs.exceptions import HGVSDataNotAvailableError, HGVSUnsupportedOperationError, HGVSInvalidVariantError
 
 _logger = logging.getLogger(__name__)
@@ -61,17 +62,64 @@ class Normalizer(object):
         if validate:
             self.validator = hgvs.validator.IntrinsicValidator()
         self.hm = hgvs.variantmapper.VariantMapper(self.hdp)
+        # config values are strings
+        self._fetch_alt_ac = lru_cache(maxsize=int(hgvs.global_config.lru_cache.maxsize))(self._fetch_alt_ac)
 
     def normalize(self, var):
         """Perform sequence variants normalization for single variant
         """
+        var_n, boundary = self._prepare(var)
+        if boundary is None:
+            return var_n
+        start, end, (ref, alt) = self._normalize_alleles(var_n, boundary)
+        return self._build_variant(var, var_n, boundary, start, end, ref, alt, self.shuffle_direction)
+
+    def normalize_both(self, var):
+        """Normalize a variant in both directions, returning the 3' most
+        and 5' most variants as a tuple
+
+        The result is the same as that of normalize for Normalizers with
+        shuffle_direction=3 and 5 (e.g., the HGVS and the left-aligned
+        VCF representations), but the boundary is looked up once and
+        both shuffles use one reference window.
+        """
+        var_n, boundary = self._prepare(var)
+        if boundary is None:
+            return var_n, var_n
+        window = self._fetch_window(var_n, boundary)
+        ref, alt = self._get_ref_alt(var_n, boundary, window)
+        allele_start, allele_stop = self._allele_interval(var_n)
+        var_norms = []
+        for shuffle_direction in (3, 5):
+            start, stop, (shuffled_ref, shuffled_alt) = self._shuffle_alleles(
+                var_n, boundary, window, allele_start, allele_stop, ref, alt, shuffle_direction)
+            var_norms.append(self._build_variant(var, var_n, boundary, start + 1, stop + 1, shuffled_ref,
+                                                 shuffled_alt, shuffle_direction, window))
+        return tuple(var_norms)
+
+    def normalize_both_many(self, variants):
+        """Normalize variants in both directions; equivalent to
+        [self.normalize_both(var) for var in variants]
+
+        :param variants: iterable of SequenceVariants
+        :returns: list of (3' most, 5' most) tuples of SequenceVariants, in the order of variants
+        """
+        return [self.normalize_both(var) for var in variants]
+
+    def _prepare(self, var):
+        """Validate var and convert it to the n. or g. variant to
+        normalize
+
+        Returns the variant and its boundary, or the variant to return
+        unchanged and None.
+        """
         assert isinstance(var, hgvs.variant.SequenceVariant), "variant must be a parsed HGVS sequence variant object"
         
         if self.validator:
             self.validator.validate(var)
 
         if var.posedit.uncertain or var.posedit.pos is None:
-            return var
+            return var, None
 
         type = var.type
 
@@ -81,8 +129,8 @@ class Normalizer(object):
             raise HGVSUnsupportedOperationError("Unsupported normalization of conversion variants: {0}", format(var))
 
         if var.posedit.edit.type == "identity":
-            var_norm = copy.deepcopy(var)
-            return var_norm
+            var_norm = var.clone()
+            return var_norm, None
 
         # For c. variants normalization, first convert to n. variant
         # and perform normalization at the n. level, then convert the
@@ -101,8 +149,13 @@ class Normalizer(object):
 
         bound_s, bound_e = self._get_boundary(var)
         boundary = (bound_s, bound_e)
-        start, end, (ref, alt) = self._normalize_alleles(var, boundary)
+        return var, boundary
 
+    def _build_variant(self, var_in, var, boundary, start, end, ref, alt, shuffle_direction, window=None):
+        """Make the normalized variant of var_in from the normalized
+        alleles of var, its n. or g. form
+        """
+        type = var_in.type
         ref_len = len(ref)
         alt_len = len(alt)
 
@@ -128,10 +181,10 @@ class Normalizer(object):
         elif alt_len > ref_len:
             # ins or dup
             if ref_len == 0:
-                if self.shuffle_direction == 3:
-                    adj_seq = self._fetch_bounded_seq(var, start - alt_len - 1, end - 1, boundary)
+                if shuffle_direction == 3:
+                    adj_seq = self._fetch_bounded_seq(var, start - alt_len - 1, end - 1, boundary, window=window)
                 else:
-                    adj_seq = self._fetch_bounded_seq(var, start - 1, start + alt_len - 1, boundary)
+                    adj_seq = self._fetch_bounded_seq(var, start - 1, start + alt_len - 1, boundary, window=window)
                 # ins
                 if alt != adj_seq:
                     ref_start = start - 1
@@ -139,7 +192,7 @@ class Normalizer(object):
                     edit = hgvs.edit.NARefAlt(ref=None, alt=alt)
                 # dup
                 else:
-                    if self.shuffle_direction == 3:
+                    if shuffle_direction == 3:
                         ref_start = start - alt_len
                         ref_end = end - 1
                         edit = hgvs.edit.Dup(ref=alt)
@@ -153,7 +206,7 @@ class Normalizer(object):
                 ref_end = end - 1
                 edit = hgvs.edit.NARefAlt(ref=ref, alt=alt)
 
-        var_norm = copy.deepcopy(var)
+        var_norm = var.clone()
         var_norm.posedit.edit = edit
         var_norm.posedit.pos.start.base = ref_start
         var_norm.posedit.pos.end.base = ref_end
@@ -170,48 +223,30 @@ class Normalizer(object):
             if self.cross_boundaries:
                 return 0, float("inf")
             else:
-                # Get genomic sequence access number for this transcript
-                map_info = self.hdp.get_tx_mapping_options(var.ac)
-                if not map_info:
-                    raise HGVSDataNotAvailableError("No mapping info available for {ac}".format(ac=var.ac))
-                map_info = [item for item in map_info if item["alt_aln_method"] == self.alt_aln_method]
-                alt_ac = map_info[0]["alt_ac"]
-
-                # Get tx info
-                tx_info = self.hdp.get_tx_info(var.ac, alt_ac, self.alt_aln_method)
-                cds_start = tx_info["cds_start_i"]
-                cds_end = tx_info["cds_end_i"]
-
-                # Get exon info
-                exon_info = self.hdp.get_tx_exons(var.ac, alt_ac, self.alt_aln_method)
-                exon_starts = [exon["tx_start_i"] for exon in exon_info]
-                exon_ends = [exon["tx_end_i"] for exon in exon_info]
-                exon_starts.sort()
-                exon_ends.sort()
-                exon_starts.append(exon_ends[-1])
-                exon_ends.append(float("inf"))
-
-                # Find the end pos of the exon where the var locates
-                left = 0
-                right = float("inf")
-
-                # TODO: #242: implement methods to find tx regions
-                for i in range(0, len(exon_starts)):
-                    if (var.posedit.pos.start.base - 1 >= exon_starts[i] and
-                            var.posedit.pos.start.base - 1 < exon_ends[i]):
-                        break
-
-                for j in range(0, len(exon_starts)):
-                    if (var.posedit.pos.end.base - 1 >= exon_starts[j] and var.posedit.pos.end.base - 1 < exon_ends[j]):
-                        break
-
+                # The exon bounds and CDS of the transcript come from its
+                # TranscriptMapper, which is cached
+                tm = self.hm._fetch_TranscriptMapper(tx_ac=var.ac, alt_ac=self._fetch_alt_ac(var.ac),
+                                                     alt_aln_method=self.alt_aln_method)
+                exon_bounds = tm.tx_exon_bounds
+                cds_start = tm.cds_start_i
+                cds_end = tm.cds_end_i
+
+                # Find the exon where the var locates; positions after the
+                # last exon are bounded by its end
+                i = bisect.bisect_right(exon_bounds, var.posedit.pos.start.base - 1) - 1
+                j = bisect.bisect_right(exon_bounds, var.posedit.pos.end.base - 1) - 1
                 if i != j:
                     raise HGVSUnsupportedOperationError(
                         "Unsupported normalization of variants spanning the exon-intron boundary ({var})".format(var=
                                                                                                                  var))
 
-                left = exon_starts[i]
-                right = exon_ends[i]
+                if 0 <= i < len(exon_bounds) - 1:
+                    left, right = exon_bounds[i], exon_bounds[i + 1]
+                else:
+                    left, right = exon_bounds[-1], float("inf")
+
+                if cds_start is None:
+                    return left, right
 
                 if var.posedit.pos.end.base - 1 < cds_start:
                     right = min(right, cds_start)
@@ -234,10 +269,23 @@ class Normalizer(object):
             # For variant type of g and m etc.
             return 0, float("inf")
 
-    def _fetch_bounded_seq(self, var, start, end, boundary):
+    def _fetch_alt_ac(self, tx_ac):
+        """Get the genomic sequence accession for the transcript
+        """
+        map_info = self.hdp.get_tx_mapping_options(tx_ac)
+        if not map_info:
+            raise HGVSDataNotAvailableError("No mapping info available for {ac}".format(ac=tx_ac))
+        map_info = [item for item in map_info if item["alt_aln_method"] == self.alt_aln_method]
+        return map_info[0]["alt_ac"]
+
+    def _fetch_bounded_seq(self, var, start, end, boundary, partial=False, window=None):
         """Fetch reference sequence from hgvs data provider.
 
-        The start position is 0 and the interval is half open
+        The start position is 0 and the interval is half open.  If
+        partial, a sequence that ends before end (at the end of the
+        reference sequence) is returned rather than raising an error.
+        If the interval lies within window (see _fetch_window), it is
+        taken from there.
         """
 
         start = start if start >= boundary[0] else boundary[0]
@@ -245,14 +293,17 @@ class Normalizer(object):
         if start >= end:
             return ""
 
+        if window is not None and window[0] <= start and end <= window[0] + len(window[1]):
+            return window[1][start - window[0]:end - window[0]]
+
         seq = self.hdp.get_seq(var.ac, start, end)
 
-        if len(seq) < end - start:
+        if len(seq) < end - start and not partial:
             raise HGVSInvalidVariantError("Variant span is outside sequence bounds ({var})".format(var=var))
 
         return seq
 
-    def _get_ref_alt(self, var, boundary):
+    def _get_ref_alt(self, var, boundary, window=None):
         """Get reference allele and alternative allele of the variant
         """
 
@@ -262,7 +313,8 @@ class Normalizer(object):
         else:
             # For NARefAlt and Inv
             if var.posedit.edit.ref_s is None or var.posedit.edit.ref == "":
-                ref = self._fetch_bounded_seq(var, var.posedit.pos.start.base - 1, var.posedit.pos.end.base, boundary)
+                ref = self._fetch_bounded_seq(var, var.posedit.pos.start.base - 1, var.posedit.pos.end.base, boundary,
+                                              window=window)
             else:
                 ref = var.posedit.edit.ref
 
@@ -273,7 +325,7 @@ class Normalizer(object):
             alt = ""
         elif var.posedit.edit.type == "dup":
             alt = var.posedit.edit.ref or self._fetch_bounded_seq(var, var.posedit.pos.start.base - 1,
-                                                                  var.posedit.pos.end.base, boundary)
+                                                                  var.posedit.pos.end.base, boundary, window=window)
         elif var.posedit.edit.type == "inv":
             alt = reverse_complement(ref)
         elif var.posedit.edit.type == "identity":
@@ -286,68 +338,96 @@ class Normalizer(object):
         """
 
         ref, alt = self._get_ref_alt(var, boundary)
-        win_size = hgvs.global_config.normalizer.window_size
+        win_size = int(hgvs.global_config.normalizer.window_size)
+        start, stop = self._allele_interval(var)
 
         if self.shuffle_direction == 3:
-            if var.posedit.edit.type == "ins":
-                base = var.posedit.pos.start.base
-                start = 1
-                stop = 1
-            elif var.posedit.edit.type == "dup":
-                base = var.posedit.pos.end.base
-                start = 1
-                stop = 1
-            else:
-                base = var.posedit.pos.start.base
-                start = 0
-                stop = var.posedit.pos.end.base - base + 1
+            # a window of win_size bases beyond the alleles, plus the base
+            # before an insertion
+            seq_start = start if start < stop else start - 1
+            seq_end = stop + win_size
+        else:
+            # a window of win_size bases before the variant
+            seq_start = max(var.posedit.pos.start.base - 1 - win_size, 0)
+            seq_end = stop
+        seq_start = max(seq_start, boundary[0])
+        window = [seq_start, self._fetch_bounded_seq(var, seq_start, seq_end, boundary)]
+
+        start, stop, (ref, alt) = self._shuffle_alleles(var, boundary, window, start, stop, ref, alt,
+                                                        self.shuffle_direction)
+        return start + 1, stop + 1, (ref, alt)
+
+    def _allele_interval(self, var):
+        """Return the interbase interval of the reference allele of var
+        (empty, after the inserted sequence, for ins and dup)
+        """
+        if var.posedit.edit.type == "ins":
+            return var.posedit.pos.start.base, var.posedit.pos.start.base
+        if var.posedit.edit.type == "dup":
+            return var.posedit.pos.end.base, var.posedit.pos.end.base
+        return var.posedit.pos.start.base - 1, var.posedit.pos.end.base
+
+    def _fetch_window(self, var, boundary):
+        """Fetch the reference sequence from win_size bases before to
+        win_size bases after the variant, as a [start, sequence] window
+        for shuffling in both directions
+        """
+        win_size = int(hgvs.global_config.normalizer.window_size)
+        start, stop = self._allele_interval(var)
+        if var.posedit.edit.type == "dup":
+            start = var.posedit.pos.start.base - 1
+        seq_start = max(start - win_size, boundary[0], 0)
+        seq = self._fetch_bounded_seq(var, seq_start, stop + win_size, boundary, partial=True)
+        if seq_start + len(seq) < min(stop, boundary[1]):
+            raise HGVSInvalidVariantError("Variant span is outside sequence bounds ({var})".format(var=var))
+        return [seq_start, seq]
+
+    def _shuffle_alleles(self, var, boundary, window, start, stop, ref, alt, shuffle_direction):
+        """Shuffle alleles (ref, alt) at the interbase interval [start,
+        stop) to the 3' or 5' most position
 
-            while True:
-                ref_seq = self._fetch_bounded_seq(var, base - 1, base + stop - 1 + win_size, boundary)
-                if ref_seq == "":
+        window is a [start, sequence] list of reference sequence around
+        the variant.  When shuffling reaches the end of the window, the
+        window is doubled and only the bases beyond those already fetched
+        are fetched; window is updated with them.
+        """
+        win_size = int(hgvs.global_config.normalizer.window_size)
+        ext_size = win_size
+        seq_start, seq = window
+
+        if shuffle_direction == 3:
+            while seq:
+                orig_start = start
+                start, stop, (ref, alt) = normalize_alleles(seq, start - seq_start, stop - seq_start, (ref, alt),
+                                                            len(seq), win_size, False)
+                start, stop = start + seq_start, stop + seq_start
+                if stop < seq_start + len(seq) or start == orig_start:
                     break
-                orig_start, orig_stop = start, stop
-                start, stop, (ref, alt) = normalize_alleles(ref_seq, start, stop, (ref, alt), len(ref_seq), win_size,
-                                                            False)
-                if stop < len(ref_seq) or start == orig_start:
+                ext_size *= 2
+                ext_seq = self._fetch_bounded_seq(var, seq_start + len(seq), seq_start + len(seq) + ext_size,
+                                                  boundary, partial=True)
+                if ext_seq == "":
                     break
-                # if stop at the end of the window, try to extend the shuffling to the right
-                base += start - orig_start
-                stop -= start - orig_start
-                start = orig_start
-
-        elif self.shuffle_direction == 5:
-            if var.posedit.edit.type == "ins":
-                base = max(var.posedit.pos.start.base - win_size, 1)
-                start = var.posedit.pos.end.base - base
-                stop = var.posedit.pos.end.base - base
-            elif var.posedit.edit.type == "dup":
-                base = max(var.posedit.pos.start.base - win_size, 1)
-                start = var.posedit.pos.end.base - base + 1
-                stop = var.posedit.pos.end.base - base + 1
-            else:
-                base = max(var.posedit.pos.start.base - win_size, 1)
-                start = var.posedit.pos.start.base - base
-                stop = var.posedit.pos.end.base - base + 1
-
-            while True:
-                if base < boundary[0] + 1:
-                    start -= boundary[0] + 1 - base
-                    stop -= boundary[0] + 1 - base
-                    base = boundary[0] + 1
-                ref_seq = self._fetch_bounded_seq(var, base - 1, base + stop - 1, boundary)
-                if ref_seq == "":
+                seq += ext_seq
+
+        elif shuffle_direction == 5:
+            while seq:
+                orig_stop = stop
+                start, stop, (ref, alt) = normalize_alleles(seq, start - seq_start, stop - seq_start, (ref, alt), 0,
+                                                            win_size, True)
+                start, stop = start + seq_start, stop + seq_start
+                if start > seq_start or stop == orig_stop:
                     break
-                orig_start, orig_stop = start, stop
-                start, stop, (ref, alt) = normalize_alleles(ref_seq, start, stop, (ref, alt), 0, win_size, True)
-                if start > 0 or stop == orig_stop:
+                ext_size *= 2
+                ext_start = max(seq_start - ext_size, boundary[0])
+                ext_seq = self._fetch_bounded_seq(var, ext_start, seq_start, boundary)
+                if ext_seq == "":
                     break
-                # if stop at the end of the window, try to extend the shuffling to the left
-                base -= orig_stop - stop
-                start += orig_stop - stop
-                stop = orig_stop
+                seq = ext_seq + seq
+                seq_start = ext_start
 
-        return base + start, base + stop, (ref, alt)
+        window[:] = [seq_start, seq]
+        return start, stop, (ref, alt)
 
 
 if __name__ == "__main__":
@@ -2,20 +2,40 @@
 """Provides parser for HGVS strings and HGVS-related conceptual
 components, such as intronic-offset coordiates
 
+Compiling the OMeta grammar is expensive (seconds), so the generated
+grammar code is written once to a Python module in a cache directory
+and re-imported by later processes.  The module name includes a
+digest of the grammar source and the parsley version, so edits to the
+grammar or an upgrade of parsley result in a fresh compilation.  The
+cache directory is taken from the HGVS_CACHE_DIR environment variable
+and defaults to ~/.cache/hgvs.  Within a process, all Parser instances
+for the same grammar share a single compiled grammar.
+
 """
 
 from __future__ import absolute_import, division, print_function, unicode_literals
 
+import collections
+import hashlib
+import imp
+import itertools
 import logging
+import os
 import re
+import sys
+import tempfile
+import threading
 
 from pkg_resources import resource_filename
 
 import bioutils.sequences
+import ometa.builder
+import ometa.grammar
 import ometa.runtime
 import parsley
 
-from hgvs.exceptions import HGVSParseError
+from hgvs.decorators.lru_cache import lru_cache
+from hgvs.exceptions import HGVSError, HGVSParseError, HGVSUsageError
 
 # The following imports are referenced by fully-qualified name in the
 # hgvs grammar.
@@ -25,6 +45,113 @@ import hgvs.location
 import hgvs.posedit
 import hgvs.variant
 
+import hgvs.utils.fastparse
+
+
+_logger = logging.getLogger(__name__)
+
+_default_grammar_fn = resource_filename(__name__, "_data/hgvs.pymeta")
+_grammar_bindings = {"hgvs": hgvs, "bioutils": bioutils}
+_grammars = {}    # (grammar_fn, recognize_only) -> wrapped grammar, shared by all Parser instances
+_grammars_lock = threading.Lock()
+
+# every string accepted by the hgvs_variant rule matches this; see Parser.check
+_plausible_variant_re = re.compile(r"[^\W\d_][^\W_]+(?:_[^\W_]+)?(?:\.\d+)?:[cgmnpr]\.[\w.:+*?()=>-]+\Z", re.UNICODE)
+
+
+class _Recognized(object):
+    """Stands in for the hgvs and bioutils modules in grammar actions
+    when only recognition is needed.  Every attribute and call returns
+    the same instance, so no objects are built while parsing."""
+
+    def __getattr__(self, name):
+        return self
+
+    def __call__(self, *args, **kwargs):
+        return self
+
+
+_recognized = _Recognized()
+_recognizer_bindings = {"hgvs": _recognized, "bioutils": _recognized}
+
+
+def _default_cache_dir():
+    return os.environ.get("HGVS_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "hgvs"))
+
+
+def _grammar_module_name(grammar_source):
+    """return a module name that identifies the generated code for
+    grammar_source and the installed parsley version"""
+    digest = hashlib.sha1(parsley.__version__.encode("ascii") + b"\0" + grammar_source).hexdigest()
+    return "hgvs_grammar_" + digest[:16]
+
+
+def _generate_grammar_code(grammar_source):
+    "return the Python source that OMeta generates for grammar_source"
+    tree = ometa.grammar.OMeta(grammar_source).parseGrammar("Grammar")
+    return ometa.builder.writePython(tree, grammar_source)
+
+
+def compile_grammar(grammar_fn=None, cache_dir=None):
+    """compile the grammar in grammar_fn to an importable module in
+    cache_dir and return the module path
+
+    Existing modules are left untouched. This may be called at
+    build/deployment time to spare the first Parser construction the
+    compilation cost.
+
+    """
+    grammar_fn = grammar_fn or _default_grammar_fn
+    cache_dir = cache_dir or _default_cache_dir()
+    with open(grammar_fn, "rb") as f:
+        grammar_source = f.read()
+    mod_path = os.path.join(cache_dir, _grammar_module_name(grammar_source) + ".py")
+    if os.path.exists(mod_path):
+        return mod_path
+    if not os.path.isdir(cache_dir):
+        os.makedirs(cache_dir)
+    code = _generate_grammar_code(grammar_source)
+    # write to a temporary file and rename so that concurrent workers never see a partial module
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=cache_dir)
+    with os.fdopen(fd, "wb") as f:
+        f.write(code.encode("utf-8") + b"\n")
+    os.rename(tmp_path, mod_path)
+    _logger.info("Compiled grammar {fn} to {mod_path}".format(fn=grammar_fn, mod_path=mod_path))
+    return mod_path
+
+
+def _load_grammar_class(grammar_fn, bindings):
+    """return the parser class for grammar_fn, importing the compiled
+    module from the cache directory (compiling it if necessary), and
+    falling back to in-memory compilation if the cache is unusable"""
+    try:
+        mod_path = compile_grammar(grammar_fn)
+        mod_name = str(os.path.splitext(os.path.basename(mod_path))[0])
+        mod = sys.modules.get(mod_name) or imp.load_source(mod_name, mod_path)
+        return mod.createParserClass(ometa.runtime.OMetaBase, bindings)
+    except (IOError, OSError, SyntaxError) as e:
+        _logger.warning("Grammar cache unavailable ({e}); compiling {fn} in memory".format(e=e, fn=grammar_fn))
+        return parsley.makeGrammar(open(grammar_fn, "r").read(), bindings, unwrap=True)
+
+
+def get_grammar(grammar_fn, recognize_only=False):
+    """return the process-wide (parsley-wrapped) grammar for grammar_fn
+
+    If recognize_only is True, the grammar's actions build no objects;
+    rules succeed or fail exactly as they would otherwise, but return
+    placeholders.
+
+    """
+    key = (grammar_fn, recognize_only)
+    grammar = _grammars.get(key)
+    if grammar is None:
+        with _grammars_lock:
+            grammar = _grammars.get(key)
+            if grammar is None:
+                bindings = _recognizer_bindings if recognize_only else _grammar_bindings
+                grammar = _grammars[key] = parsley.wrapGrammar(_load_grammar_class(grammar_fn, bindings))
+    return grammar
+
 
 class Parser(object):
     """Provides comprehensive parsing of HGVS varaint strings (*i.e.*,
@@ -79,15 +206,48 @@ class Parser(object):
       >>> hp.parse_c_interval("22+1")
       Interval(start=22+1, end=22+1, uncertain=False)
 
+    With `fast=True`, the variant parse methods first try a set of
+    regular expressions for the most common g., c., and n. variants
+    (definite positions with substitution, del, ins, delins, or dup
+    edits; see :mod:`hgvs.utils.fastparse`), and use the grammar
+    only when those don't match.  The results are identical to those
+    from the grammar.
+
+    With `cache_size=N` (N > 0), `parse_hgvs_variant` results are
+    memoized in an LRU cache of N input strings.  Because variants are
+    mutable (and the normalizer and mapper modify edits in place), a
+    cache hit returns a copy of the cached variant unless
+    `cache_shared=True`, in which case the cached instance itself is
+    returned and callers must treat it as read-only.  Cache statistics
+    are available from `cache_info()`.
+
+      >>> hpc = Parser(cache_size=1000)
+      >>> v = hpc.parse_hgvs_variant("NM_01234.5:c.22+1A>T")
+      >>> v = hpc.parse_hgvs_variant("NM_01234.5:c.22+1A>T")
+      >>> hpc.cache_info()
+      CacheInfo(hits=1, misses=1, maxsize=1000, currsize=1)
+
     """
 
-    __default_grammar_fn = resource_filename(__name__, "_data/hgvs.pymeta")
+    __default_grammar_fn = _default_grammar_fn
 
-    def __init__(self, grammar_fn=__default_grammar_fn, expose_all_rules=False):
+    def __init__(self, grammar_fn=__default_grammar_fn, expose_all_rules=False, fast=False, cache_size=0,
+                 cache_shared=False):
+        if fast and grammar_fn != _default_grammar_fn:
+            raise HGVSUsageError("fast parsing is available only with the default grammar")
         self._grammar_fn = grammar_fn
-        self._grammar = parsley.makeGrammar(open(grammar_fn, "r").read(), {"hgvs": hgvs, "bioutils": bioutils})
+        self._fast = fast
+        self._cache_size = cache_size
+        self._cache_shared = cache_shared
+        self._parse_cache = None
+        self._recognizer = None
+        self._grammar = get_grammar(grammar_fn)
         self._logger = logging.getLogger(__name__)
         self._expose_rule_functions(expose_all_rules)
+        if fast:
+            self._expose_fast_functions()
+        if cache_size:
+            self._expose_cached_functions()
 
     def _expose_rule_functions(self, expose_all_rules=False):
         """add parse functions for public grammar rules
@@ -106,9 +266,11 @@ class Parser(object):
                 try:
                     return self._grammar(s).__getattr__(rule_name)()
                 except ometa.runtime.ParseError as exc:
+                    reason = exc.formatReason()
                     raise HGVSParseError("{s}: char {exc.position}: {reason}".format(s=s,
                                                                                      exc=exc,
-                                                                                     reason=exc.formatReason()))
+                                                                                     reason=reason),
+                                         s=s, position=exc.position, reason=reason)
             rule_fxn.func_doc = "parse string s using `%s' rule" % rule_name
             return rule_fxn
 
@@ -123,6 +285,151 @@ class Parser(object):
             self.__setattr__(att_name, rule_fxn)
         self._logger.debug("Exposed {n} rules ({rules})".format(n=len(exposed_rules), rules=", ".join(exposed_rules)))
 
+    def _expose_fast_functions(self):
+        """wrap variant parse functions so that simple g., c., and n.
+        variants are parsed by hgvs.utils.fastparse, falling back to the
+        grammar for everything else"""
+
+        def make_fast_parse_function(rule_fxn, types):
+            def fast_rule_fxn(s):
+                i = s.find(":")
+                if i > 0 and s[i + 1:i + 2] in types:
+                    var = hgvs.utils.fastparse.parse_simple_variant(s)
+                    if var is not None:
+                        return var
+                return rule_fxn(s)
+            fast_rule_fxn.func_doc = rule_fxn.func_doc
+            return fast_rule_fxn
+
+        for rule_name, types in [("hgvs_variant", "cgn"), ("c_variant", "c"), ("g_variant", "g"), ("n_variant", "n")]:
+            att_name = "parse_" + rule_name
+            self.__setattr__(att_name, make_fast_parse_function(getattr(self, att_name), types))
+
+    def _expose_cached_functions(self):
+        """wrap parse_hgvs_variant with a bounded LRU cache keyed on the input string"""
+        cached_rule_fxn = lru_cache(maxsize=self._cache_size)(self.parse_hgvs_variant)
+        cache_shared = self._cache_shared
+
+        def parse_hgvs_variant(s):
+            var = cached_rule_fxn(s)
+            return var if cache_shared else var.clone()
+
+        parse_hgvs_variant.func_doc = cached_rule_fxn.func_doc
+        self._parse_cache = cached_rule_fxn
+        self.parse_hgvs_variant = parse_hgvs_variant
+
+    def cache_info(self):
+        """return parse cache statistics as (hits, misses, maxsize,
+        currsize), or None if caching is disabled"""
+        return self._parse_cache.cache_info() if self._parse_cache else None
+
+    def cache_clear(self):
+        """clear the parse cache and its statistics"""
+        if self._parse_cache:
+            self._parse_cache.cache_clear()
+
+    def check(self, s):
+        """return the sequence type (e.g., "c") if s is a valid HGVS
+        variant, or None otherwise, without building the variant or
+        formatting an error message
+
+        >>> hp = Parser()
+        >>> hp.check("NM_01234.5:c.22+1A>T")
+        u'c'
+        >>> hp.check("NM_01234.5:c.22+1A>") is None
+        True
+
+        Checking uses the same grammar as parsing (and the fast path
+        when `fast=True`), so a string is valid exactly when
+        parse_hgvs_variant succeeds, apart from the few checks made
+        when objects are constructed.  Strings that cannot be variants
+        at all (wrong prefix or characters outside the grammar) are
+        rejected without running the grammar.  Use parse_hgvs_variant
+        to obtain the reason that a string is invalid.
+
+        """
+        if self._fast:
+            t = hgvs.utils.fastparse.match_simple_variant(s)
+            if t is not None:
+                return t
+        if self._grammar_fn == _default_grammar_fn and _plausible_variant_re.match(s) is None:
+            return None
+        if self._recognizer is None:
+            self._recognizer = get_grammar(self._grammar_fn, recognize_only=True)
+        try:
+            self._recognizer(s).hgvs_variant()
+        except ometa.runtime.ParseError:
+            return None
+        return s[s.find(":") + 1]
+
+    def check_many(self, variants):
+        """check an iterable of HGVS variant strings, yielding the
+        sequence type or None for each (see `check`)"""
+        for s in variants:
+            yield self.check(s)
+
+    def parse_many(self, variants, processes=None, chunksize=1000):
+        """parse an iterable of HGVS variant strings, yielding one result
+        per input in input order
+
+        Each result is either a SequenceVariant or, for inputs that
+        cannot be parsed, the HGVSError instance that
+        parse_hgvs_variant would have raised (usually an
+        HGVSParseError, with `s`, `position`, and `reason`).  Errors
+        are returned, not raised, so that bad inputs don't interrupt
+        the stream.
+
+        :param variants: iterable of HGVS strings; consumed lazily
+        :param processes: number of worker processes; None means one per CPU, and 1 parses in this process
+        :param chunksize: number of variants sent to a worker at a time
+
+        At most two chunks per worker are in flight at any time, so
+        memory use is bounded regardless of the length of `variants`.
+
+        """
+        if processes == 1:
+            for s in variants:
+                yield self._parse_or_error(s)
+            return
+
+        import multiprocessing
+        processes = processes or multiprocessing.cpu_count()
+        pool = multiprocessing.Pool(processes, initializer=_init_parse_worker,
+                                    initargs=(self._grammar_fn, self._fast, self._cache_size, self._cache_shared))
+        try:
+            pending = collections.deque()
+            variants = iter(variants)
+            while True:
+                chunk = list(itertools.islice(variants, chunksize))
+                if chunk:
+                    pending.append(pool.apply_async(_parse_chunk, (chunk, )))
+                if not pending:
+                    break
+                if len(pending) >= 2 * processes or not chunk:
+                    for result in pending.popleft().get():
+                        yield result
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def _parse_or_error(self, s):
+        try:
+            return self.parse_hgvs_variant(s)
+        except HGVSError as e:
+            return e
+
+
+_worker_parser = None
+
+
+def _init_parse_worker(grammar_fn, fast, cache_size, cache_shared):
+    global _worker_parser
+    _worker_parser = Parser(grammar_fn=grammar_fn, fast=fast, cache_size=cache_size, cache_shared=cache_shared)
+
+
+def _parse_chunk(chunk):
+    return [_worker_parser._parse_or_error(s) for s in chunk]
+
 
 
 # <LICENSE>
@@ -7,14 +7,18 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 import recordtype
 
+import hgvs.utils
 from hgvs.exceptions import HGVSError, HGVSUnsupportedOperationError
 
 
-class PosEdit(recordtype.recordtype('PosEdit', [('pos', None), ('edit', None), ('uncertain', False)])):
+class PosEdit(hgvs.utils.CloneMixin,
+              recordtype.recordtype('PosEdit', [('pos', None), ('edit', None), ('uncertain', False)])):
     """
     represents a **simple** variant, consisting of a single position and edit pair
     """
 
+    __slots__ = ()
+
     def format(self, conf=None):
         """Formatting the string of PosEdit
         """
@@ -6,8 +6,6 @@ via a common reference sequence.
 
 from __future__ import absolute_import, division, print_function, unicode_literals
 
-import copy
-
 import hgvs
 import hgvs.transcriptmapper
 
@@ -34,8 +32,9 @@ class Projector(object):
             dst_alt_aln_method=hgvs.global_config.mapping.alt_aln_method):
         self.hdp = hdp
         self.alt_ac = alt_ac
-        self.src_tm = hgvs.transcriptmapper.TranscriptMapper(hdp, src_ac, alt_ac, src_alt_aln_method)
-        self.dst_tm = hgvs.transcriptmapper.TranscriptMapper(hdp, dst_ac, alt_ac, dst_alt_aln_method)
+        tm_registry = hgvs.transcriptmapper.TranscriptMapperRegistry.for_hdp(hdp)
+        self.src_tm = tm_registry.get(src_ac, alt_ac, src_alt_aln_method)
+        self.dst_tm = tm_registry.get(dst_ac, alt_ac, dst_alt_aln_method)
 
     def project_interval_forward(self, c_interval):
         """
@@ -66,7 +65,7 @@ class Projector(object):
         """
         if c_variant.ac != self.src_tm.tx_ac:
             raise RuntimeError("variant accession does not match that used to initialize " + __name__)
-        new_c_variant = copy.deepcopy(c_variant)
+        new_c_variant = c_variant.clone()
         new_c_variant.ac = self.dst_tm.tx_ac
         new_c_variant.posedit.pos = self.project_interval_forward(c_variant.posedit.pos)
         return new_c_variant
@@ -80,7 +79,7 @@ class Projector(object):
         """
         if c_variant.ac != self.dst_tm.tx_ac:
             raise RuntimeError("variant accession does not match that used to initialize " + __name__)
-        new_c_variant = copy.deepcopy(c_variant)
+        new_c_variant = c_variant.clone()
         new_c_variant.ac = self.src_tm.tx_ac
         new_c_variant.posedit.pos = self.project_interval_backward(c_variant.posedit.pos)
         return new_c_variant
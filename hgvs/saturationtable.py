@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""protein consequences of every substitution in a coding sequence
+
+A SaturationTable holds, for each of the 3 alternate bases at each
+position of a transcript's CDS, the consequence of the substitution
+on the protein, computed for the whole CDS at once from the reference
+codons:
+
+* `consequences` is an int8 array with one row per CDS position and one
+  column per base (A, C, G, T), holding one of the codes below
+* `alt_aas` holds the alternate amino acid (a 1-letter code as a byte,
+  or 0 if unknown) in the same layout
+
+lookup(pos, alt) returns the p. SequenceVariant for c.{pos}{ref}>{alt},
+equal to the one VariantMapper.c_to_p returns.  Synonymous, missense,
+and nonsense variants are built from the table; substitutions in the
+start and stop codons, and all substitutions in a CDS that is not
+whole codons ending in a single stop, are passed to c_to_p.
+
+SaturationTable requires NumPy.
+
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import itertools
+
+import numpy as np
+
+import hgvs
+import hgvs.edit
+import hgvs.location
+import hgvs.posedit
+import hgvs.variant
+import hgvs.variantmapper
+from hgvs.exceptions import HGVSUsageError
+from hgvs.utils.altseqbuilder import is_regular_cds
+from hgvs.utils.translate import translate_cds
+
+# consequence codes
+NO_CHANGE = -1    # the alternate base is the reference base
+UNKNOWN = 0    # not determined from the table; see c_to_p
+SYNONYMOUS = 1
+MISSENSE = 2
+NONSENSE = 3
+STOP_LOSS = 4
+START_LOSS = 5
+
+bases = "ACGT"
+
+# base (as a byte) to column index; other bytes map to -1
+_base_index = np.full(256, -1, dtype=np.int8)
+for _i, _b in enumerate(bases):
+    _base_index[ord(_b)] = _base_index[ord(_b.lower())] = _i
+
+# amino acid (as a byte) for each codon, indexed by 16 * b1 + 4 * b2 + b3
+_codon_aas = np.frombuffer(translate_cds("".join("".join(c) for c in itertools.product(bases, repeat=3)))
+                           .encode("ascii"), dtype=np.uint8)
+_codon_weights = np.array([16, 4, 1], dtype=np.int64)
+
+
+class SaturationTable(object):
+    """protein consequences of all substitutions in a CDS; see module docstring"""
+
+    def __init__(self, vm, tx_ac, pro_ac=None):
+        """
+        :param vm: VariantMapper, which provides reference data and c_to_p
+        :param str tx_ac: coding transcript accession
+        :param str pro_ac: protein accession, or None to use the one for the transcript
+        """
+        self._vm = vm
+        self._pro_ac = pro_ac
+        self.tx_ac = tx_ac
+        self._p_is_uncertain = hgvs.global_config.mapping.inferred_p_is_uncertain
+        self.ref_data = vm._fetch_RefTranscriptData(tx_ac, pro_ac)
+        self.cds = self.ref_data.transcript_sequence[self.ref_data.cds_start - 1:self.ref_data.cds_stop]
+        self.consequences, self.alt_aas = _build_table(self.cds, is_regular_cds(self.ref_data))
+
+    def __len__(self):
+        return len(self.cds)
+
+    def consequence(self, pos, alt):
+        """return the consequence code for c.{pos}{ref}>{alt}"""
+        return int(self.consequences[self._row(pos), self._column(alt)])
+
+    def lookup(self, pos, alt):
+        """return the p. SequenceVariant for c.{pos}{ref}>{alt}, as
+        VariantMapper.c_to_p would"""
+        i, j = self._row(pos), self._column(alt)
+        code = self.consequences[i, j]
+        if code == NO_CHANGE:
+            raise HGVSUsageError("{alt} is the reference base at c.{pos}".format(alt=alt, pos=pos))
+        aa_pos = i // 3 + 1
+        if code not in (SYNONYMOUS, MISSENSE, NONSENSE) or aa_pos == 1 or aa_pos == len(self.ref_data.aa_sequence):
+            var_c = hgvs.variant.SequenceVariant(
+                ac=self.tx_ac,
+                type="c",
+                posedit=hgvs.posedit.PosEdit(
+                    hgvs.location.BaseOffsetInterval(
+                        start=hgvs.location.BaseOffsetPosition(base=pos, datum=hgvs.location.CDS_START),
+                        end=hgvs.location.BaseOffsetPosition(base=pos, datum=hgvs.location.CDS_START)),
+                    hgvs.edit.NARefAlt(ref=self.cds[i], alt=bases[j])))
+            return hgvs.variantmapper.VariantMapper.c_to_p(self._vm, var_c, self._pro_ac)
+
+        # as built by AltSeqToHgvsp for a substitution within the protein
+        aa_start = hgvs.location.AAPosition(base=aa_pos, aa=self.ref_data.aa_sequence[aa_pos - 1])
+        if code == SYNONYMOUS:
+            edit = hgvs.edit.AARefAlt(ref="", alt="")
+        else:
+            edit = hgvs.edit.AASub(ref="", alt=chr(self.alt_aas[i, j]))
+        posedit = hgvs.posedit.PosEdit(hgvs.location.Interval(start=aa_start, end=aa_start), edit)
+        posedit.uncertain = self._p_is_uncertain
+        return hgvs.variant.SequenceVariant(self.ref_data.protein_accession, "p", posedit)
+
+    def _row(self, pos):
+        if not 1 <= pos <= len(self.cds):
+            raise HGVSUsageError("c.{pos} is outside the CDS of {ac}".format(pos=pos, ac=self.tx_ac))
+        return pos - 1
+
+    def _column(self, alt):
+        j = bases.find(alt.upper()) if len(alt) == 1 else -1
+        if j == -1:
+            raise HGVSUsageError("Alternate base must be one of {bases}; got {alt}".format(bases=bases, alt=alt))
+        return j
+
+    def __repr__(self):
+        return "SaturationTable({ac}, {n} positions)".format(ac=self.tx_ac, n=len(self))
+
+
+def _build_table(cds, is_regular):
+    """return the consequence codes and alternate amino acids for all
+    substitutions in cds"""
+    n = len(cds)
+    consequences = np.full((n, 4), UNKNOWN, dtype=np.int8)
+    alt_aas = np.zeros((n, 4), dtype=np.uint8)
+    base_ids = _base_index[np.frombuffer(cds.encode("ascii"), dtype=np.uint8)].astype(np.int64)
+    consequences[base_ids[:, None] == np.arange(4)] = NO_CHANGE
+    if not is_regular or n < 6:
+        return consequences, alt_aas
+
+    codons = base_ids.reshape(-1, 3)
+    valid = (codons >= 0).all(axis=1)
+    ref_codons = np.where(valid, codons.dot(_codon_weights), 0)
+    # codon for each (codon, position in codon, alternate base)
+    alt_codons = (ref_codons[:, None, None] +
+                  (np.arange(4)[None, None, :] - codons[:, :, None]) * _codon_weights[None, :, None])
+    alt_codons[~valid] = 0
+    alt = _codon_aas[alt_codons].reshape(n, 4)
+    ref = np.repeat(_codon_aas[ref_codons], 3)[:, None]
+
+    codes = np.where(alt == ref, SYNONYMOUS, np.where(alt == ord("*"), NONSENSE, MISSENSE)).astype(np.int8)
+    codes[:3] = np.where(alt[:3] == ref[:3], SYNONYMOUS, START_LOSS)
+    codes[-3:] = np.where(alt[-3:] == ord("*"), SYNONYMOUS, STOP_LOSS)
+    invalid = np.repeat(~valid, 3)
+    codes[invalid] = UNKNOWN
+    alt[invalid] = 0
+    same = consequences == NO_CHANGE
+    consequences = np.where(same, NO_CHANGE, codes).astype(np.int8)
+    alt_aas = np.where(same, 0, alt).astype(np.uint8)
+    return consequences, alt_aas
+
+# <LICENSE>
+# Copyright 2013-2015 HGVS Contributors (https://bitbucket.org/biocommons/hgvs)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# </LICENSE>
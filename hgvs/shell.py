@@ -7,14 +7,14 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 import logging
 
-import IPython
-
 hgvs_g = "NC_000007.13:g.36561662C>T"
 hgvs_c = "NM_001637.3:c.1582G>A"
 hgvs_p = "NP_001628.1:p.(Gly528Arg)"
 
 
 def shell():
+    import IPython
+
     logging.basicConfig(level=logging.INFO)
 
     import hgvs
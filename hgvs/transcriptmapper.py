@@ -8,9 +8,11 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 from bioutils.coordinates import strand_int_to_pm
 
+import hgvs
 import hgvs.intervalmapper
 import hgvs.location
 
+from hgvs.decorators.lru_cache import lru_cache
 from hgvs.exceptions import HGVSError, HGVSUsageError, HGVSDataNotAvailableError
 from hgvs.utils import build_tx_cigar
 
@@ -61,9 +63,11 @@ class TranscriptMapper(object):
             self.cds_start_i = self.tx_info["cds_start_i"]
             self.cds_end_i = self.tx_info["cds_end_i"]
             self.gc_offset = self.tx_exons[0]["alt_start_i"]
-            self.cigar = build_tx_cigar(self.tx_exons, self.strand)
-            self.im = hgvs.intervalmapper.IntervalMapper.from_cigar(self.cigar)
+            self.im = hgvs.intervalmapper.IntervalMapper.from_tx_exons(self.tx_exons, self.strand)
             self.tgt_len = self.im.tgt_len
+            # exon boundaries in transcript coordinates: the start of
+            # each exon, in order, then the end of the last exon
+            self.tx_exon_bounds = [e["tx_start_i"] for e in tx_exons] + [tx_exons[-1]["tx_end_i"]]
         else:
             # this covers the identity cases n <-> c
             self.tx_identity_info = hdp.get_tx_identity_info(self.tx_ac)
@@ -74,6 +78,7 @@ class TranscriptMapper(object):
             self.cds_start_i = self.tx_identity_info["cds_start_i"]
             self.cds_end_i = self.tx_identity_info["cds_end_i"]
             self.tgt_len = sum(self.tx_identity_info["lengths"])
+            self.tx_exon_bounds = None
 
         assert not ((self.cds_start_i is None)
                     ^ (self.cds_end_i is None)), "CDS start and end must both be defined or neither defined"
@@ -83,6 +88,13 @@ class TranscriptMapper(object):
                "{strand_pm} strand; {n_exons} exons; offset={self.gc_offset}".format(
                    self=self, n_exons=len(self.tx_exons), strand_pm=strand_int_to_pm(self.strand))
 
+    @property
+    def cigar(self):
+        """the transcript CIGAR string (see hgvs.utils.build_tx_cigar); the
+        IntervalMapper is built directly from the exons, so this is
+        built only when requested"""
+        return build_tx_cigar(self.tx_exons, self.strand)
+
     @property
     def is_coding_transcript(self):
         if ((self.tx_info["cds_start_i"] is not None) ^ (self.tx_info["cds_end_i"] is not None)):
@@ -254,6 +266,194 @@ class TranscriptMapper(object):
         """convert a transcript CDS (c.) interval to a genomic (g.) interval"""
         return self.n_to_g(self.c_to_n(c_interval))
 
+    # Batch forms of the conversions above, for many positions on one
+    # transcript. Each takes and returns numpy arrays of positions
+    # (not intervals); element i of the result equals the scalar
+    # method's result for the one-position interval at element i.
+    # Datums are the hgvs.location constants (SEQ_START, CDS_START,
+    # CDS_END). Any invalid position raises for the whole batch.
+    # VariantMapper.g_to_c_batch applies them to a VariantBatch.
+    # Requires numpy.
+
+    def g_to_n_many(self, g_positions):
+        """convert an array of genomic (g.) positions (e.g.,
+        VariantBatch.starts) to transcript cDNA (n.) positions
+
+        :returns: tuple of numpy arrays (n. bases, n. offsets)
+        """
+        import numpy as np
+        g = np.asarray(g_positions, dtype=np.int64)
+        g_s, g_e = g - 1, g
+        frs, fre = self.im.map_ref_to_tgt_array(g_s - self.gc_offset, g_e - self.gc_offset, max_extent=False)
+        grs, gre = self.im.map_tgt_to_ref_array(frs, fre, max_extent=False)
+        grs, gre = grs + self.gc_offset, gre + self.gc_offset
+        if self.strand == -1:
+            frs, fre = self.tgt_len - fre, self.tgt_len - frs
+        # as in g_to_n: a 0-width interval indicates an intron
+        intron = (frs == fre).astype(np.int64)
+        if self.strand == 1:
+            start_offset = _hgvs_offset_array(g_s + intron, grs, gre + intron, self.strand)
+        else:
+            start_offset = -_hgvs_offset_array(g_e, grs, gre + intron, self.strand)
+        frs = frs - (start_offset > 0)
+        return np.where(frs >= 0, frs + 1, frs), start_offset
+
+    def n_to_g_many(self, n_bases, n_offsets):
+        """convert arrays of transcript cDNA (n.) bases and offsets to
+        genomic (g.) positions
+
+        :returns: numpy array of g. positions
+        """
+        import numpy as np
+        assert self.strand in [1, -1], "strand = " + str(self.strand) + "; must be 1 or -1"
+        b = np.asarray(n_bases, dtype=np.int64)
+        offset = np.asarray(n_offsets, dtype=np.int64)
+        if np.any(b == 0):
+            raise HGVSError("received n. base 0; expected ..,-2,-1,1,2,...")
+        frs = np.where(b > 0, b - 1, b)
+        if self.strand == 1:
+            grs, _ = self.im.map_tgt_to_ref_array(frs, frs + 1, max_extent=False)
+        else:
+            grs, _ = self.im.map_tgt_to_ref_array(self.tgt_len - frs - 1, self.tgt_len - frs, max_extent=False)
+            offset = -offset
+        gs = grs + self.gc_offset + offset
+        return np.where(gs >= 0, gs + 1, gs)
+
+    def n_to_c_many(self, n_bases):
+        """convert an array of transcript cDNA (n.) bases to transcript
+        CDS (c.) bases; offsets are unchanged
+
+        :returns: tuple of numpy arrays (c. bases, c. datums)
+        """
+        import numpy as np
+        if self.cds_start_i is None:    # cds_start_i defined iff cds_end_i defined; see assertion above
+            raise HGVSUsageError(
+                "CDS is undefined for {self.tx_ac}; cannot map to c. coordinate (non-coding transcript?)".format(self=
+                                                                                                                 self))
+        b = np.asarray(n_bases, dtype=np.int64)
+        if np.any((b <= 0) | (b > self.tgt_len)):
+            raise HGVSError("The given coordinate is outside the bounds of the reference sequence.")
+        c = np.where(b <= self.cds_start_i, b - (self.cds_start_i + 1),
+                     np.where(b <= self.cds_end_i, b - self.cds_start_i, b - self.cds_end_i))
+        datum = np.where(b <= self.cds_end_i, hgvs.location.CDS_START, hgvs.location.CDS_END)
+        return c, datum
+
+    def c_to_n_many(self, c_bases, c_datums):
+        """convert arrays of transcript CDS (c.) bases and datums to
+        transcript cDNA (n.) bases; offsets are unchanged
+
+        :returns: numpy array of n. bases
+        """
+        import numpy as np
+        if self.cds_start_i is None:    # cds_start_i defined iff cds_end_i defined; see assertion above
+            raise HGVSUsageError(
+                "CDS is undefined for {self.tx_ac}; cannot map from c. coordinate (non-coding transcript?)".format(
+                    self=self))
+        c = np.asarray(c_bases, dtype=np.int64)
+        datum = np.asarray(c_datums)
+        cds_start = datum == hgvs.location.CDS_START
+        if np.any((cds_start & (c == 0)) | ~(cds_start | (datum == hgvs.location.CDS_END))):
+            raise HGVSError("received c. base 0 or a datum other than CDS_START or CDS_END")
+        n = np.where(cds_start, np.where(c < 0, c + self.cds_start_i + 1, c + self.cds_start_i), c + self.cds_end_i)
+        if np.any((n <= 0) | (n > self.tgt_len)):
+            raise HGVSError("The given coordinate is outside the bounds of the reference sequence.")
+        return n
+
+    def g_to_c_many(self, g_positions):
+        """convert an array of genomic (g.) positions to transcript CDS
+        (c.) positions
+
+        :returns: tuple of numpy arrays (c. bases, c. offsets, c. datums)
+        """
+        n_bases, offsets = self.g_to_n_many(g_positions)
+        c_bases, datums = self.n_to_c_many(n_bases)
+        return c_bases, offsets, datums
+
+    def c_to_g_many(self, c_bases, c_offsets, c_datums):
+        """convert arrays of transcript CDS (c.) bases, offsets, and
+        datums to genomic (g.) positions
+
+        :returns: numpy array of g. positions
+        """
+        return self.n_to_g_many(self.c_to_n_many(c_bases, c_datums), c_offsets)
+
+
+class TranscriptMapperRegistry(object):
+    """Caches TranscriptMappers for one data provider, so that each
+    transcript alignment is fetched and built once and shared by all
+    components that use that data provider (VariantMapper and its
+    subclasses, Normalizer, ExtrinsicValidator,
+    SequenceVariant.fill_ref, and Projector).
+
+    Components obtain the registry with
+    TranscriptMapperRegistry.for_hdp(hdp).  To use a capacity other
+    than the configured default
+    (hgvs.global_config.lru_cache.transcript_mapper_maxsize), install
+    a registry before first use, or resize the existing one::
+
+        TranscriptMapperRegistry.for_hdp(hdp, maxsize=1000)
+
+    :param hdp: HGVS Data Provider Interface-compliant instance (see :class:`hgvs.dataproviders.interface.Interface`)
+    :param int maxsize: maximum number of TranscriptMappers retained (least recently used are discarded)
+    """
+
+    def __init__(self, hdp, maxsize=hgvs.global_config.lru_cache.transcript_mapper_maxsize):
+        self.hdp = hdp
+        self.maxsize = int(maxsize)    # config values are strings
+        self._get = lru_cache(maxsize=self.maxsize)(self._build)
+
+    @staticmethod
+    def for_hdp(hdp, maxsize=None):
+        """return the registry for hdp, creating it on first use
+
+        If maxsize is given and differs from that of the existing
+        registry, the existing registry is resized in place (see
+        resize), so that components that already hold it keep sharing
+        it.
+        """
+        registry = getattr(hdp, "_transcript_mapper_registry", None)
+        if registry is None:
+            if maxsize is None:
+                registry = TranscriptMapperRegistry(hdp)
+            else:
+                registry = TranscriptMapperRegistry(hdp, maxsize=maxsize)
+            hdp._transcript_mapper_registry = registry
+        elif maxsize is not None and int(maxsize) != registry.maxsize:
+            registry.resize(maxsize)
+        return registry
+
+    def resize(self, maxsize):
+        """change the maximum number of TranscriptMappers retained;
+        cached TranscriptMappers are discarded and statistics reset"""
+        self.maxsize = int(maxsize)
+        self._get = lru_cache(maxsize=self.maxsize)(self._build)
+
+    def get(self, tx_ac, alt_ac, alt_aln_method):
+        """return the TranscriptMapper for the given transcript, reference
+        sequence, and alignment method, building it if necessary"""
+        return self._get(tx_ac, alt_ac, alt_aln_method)
+
+    def cache_info(self):
+        """return a CacheInfo namedtuple (hits, misses, maxsize, currsize)"""
+        return self._get.cache_info()
+
+    def cache_clear(self):
+        """discard all cached TranscriptMappers and reset statistics"""
+        self._get.cache_clear()
+
+    def _build(self, tx_ac, alt_ac, alt_aln_method):
+        return TranscriptMapper(self.hdp, tx_ac=tx_ac, alt_ac=alt_ac, alt_aln_method=alt_aln_method)
+
+
+def _hgvs_offset_array(g_positions, grs, gre, strand):
+    """vectorized form of the _hgvs_offset function in
+    TranscriptMapper.g_to_n"""
+    import numpy as np
+    mid = (grs + gre) / 2
+    offset = np.where((g_positions < mid) | ((g_positions == mid) & (strand == 1)), g_positions - grs,
+                      g_positions - gre)
+    return np.where((g_positions == grs) | (g_positions == gre), 0, offset)
+
 
 def _ci_to_hgvs_coord(s, e):
     """ Convert continuous interbase (right-open) coordinates (..,-2,-1,0,1,..) to
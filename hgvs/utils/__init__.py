@@ -4,6 +4,9 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 import re
 
+# types of model field values that are immutable and need not be copied
+atomic_types = frozenset([type(None), bool, int, long, float, str, unicode])
+
 
 def build_tx_cigar(exons, strand):
     """builds a single CIGAR string representing an alignment of the
@@ -34,6 +37,32 @@ def build_tx_cigar(exons, strand):
 
     return tx_cigar_str
 
+
+def clone_record(rec):
+    """return a copy of a recordtype-based model object (variant,
+    posedit, interval, position, or edit) without calling __init__
+
+    Field values that have a clone method are cloned; all others
+    (strings, numbers, None) are immutable and are shared.  This is
+    the basis of the models' clone() methods, which are much cheaper
+    than copy.deepcopy.
+    """
+    obj = rec.__class__.__new__(rec.__class__)
+    obj.__setstate__(tuple([v if type(v) in atomic_types or not hasattr(v, "clone") else v.clone()
+                            for v in rec.__getstate__()]))
+    return obj
+
+
+class CloneMixin(object):
+    """adds clone() to recordtype-based model classes"""
+
+    __slots__ = ()
+
+    def clone(self):
+        """return a copy of this object that shares no mutable state with
+        it; equivalent to, but much faster than, copy.deepcopy"""
+        return clone_record(self)
+
 # <LICENSE>
 # Copyright 2013-2015 HGVS Contributors (https://bitbucket.org/biocommons/hgvs)
 # 
@@ -47,6 +47,12 @@ class AltSeqToHgvsp(object):
     def build_hgvsp(self):
         """Compare two amino acid sequences; generate an hgvs tag from the output
 
+        The alt sequence matches the ref sequence before the variant
+        (AltSeqBuilder changes only bases at and after it), so
+        differences are sought from variant_start_aa onward, and the
+        last difference is found within a window that grows until the
+        sequences agree beyond it (see _last_diff).
+
         :return list of variants in sequence order
         :rtype list of dict
         """
@@ -65,11 +71,11 @@ class AltSeqToHgvsp(object):
                 do_delins = False
             elif self._is_substitution:
                 if len(self._ref_seq) == len(self._alt_seq):
-                    diff_pos = [(i, self._ref_seq[i], self._alt_seq[i])
-                                for i in xrange(len(self._ref_seq)) if self._ref_seq[i] != self._alt_seq[i]]
-                    if len(diff_pos) == 1:
-                        (start, deletion, insertion) = diff_pos[0]
-                        variants.append({"start": start + 1, "ins": insertion, "del": deletion})
+                    start = self._alt_data.variant_start_aa - 1
+                    while start < len(self._ref_seq) and self._ref_seq[start] == self._alt_seq[start]:
+                        start += 1
+                    if start < len(self._ref_seq) and self._last_diff(start, start, len(self._ref_seq) - start) == 0:
+                        variants.append({"start": start + 1, "ins": self._alt_seq[start], "del": self._ref_seq[start]})
                         do_delins = False
 
                 elif (self._alt_seq[self._alt_data.variant_start_aa - 1] == "*" and
@@ -86,8 +92,8 @@ class AltSeqToHgvsp(object):
                     while self._ref_seq[start] == self._alt_seq[start]:
                         start += 1
                         aa_start += 1
-                    insertion = list(self._alt_seq[start:])
-                    deletion = list(self._ref_seq[start:])
+                    insertion = self._alt_seq[start:]
+                    deletion = self._ref_seq[start:]
                     variants.append({"start": aa_start, "ins": insertion, "del": deletion})
 
                 else:    # non-frameshifting delins or dup
@@ -101,27 +107,23 @@ class AltSeqToHgvsp(object):
                     offset = start + abs(delta)
 
                     if delta > 0:    # net insertion
-                        insertion = list(self._alt_seq[start:offset])
-                        deletion = []
-                        ref_sub = self._ref_seq[start:]
-                        alt_sub = self._alt_seq[offset:]
+                        insertion = self._alt_seq[start:offset]
+                        deletion = ""
+                        ref_start, alt_start = start, offset
                     elif delta < 0:    # net deletion
-                        insertion = []
-                        deletion = list(self._ref_seq[start:offset])
-                        ref_sub = self._ref_seq[offset:]
-                        alt_sub = self._alt_seq[start:]
+                        insertion = ""
+                        deletion = self._ref_seq[start:offset]
+                        ref_start, alt_start = offset, start
                     else:
-                        insertion = []
-                        deletion = []
-                        ref_sub = self._ref_seq[start:]
-                        alt_sub = self._alt_seq[start:]
+                        insertion = ""
+                        deletion = ""
+                        ref_start, alt_start = start, start
 
                     # from start, get del/ins out to last difference
-                    diff_indices = [i for i in xrange(len(ref_sub)) if ref_sub[i] != alt_sub[i]]
-                    if diff_indices:
-                        max_diff = diff_indices[-1] + 1
-                        insertion.extend(list(alt_sub[:max_diff]))
-                        deletion.extend(list(ref_sub[:max_diff]))
+                    length = max(len(self._ref_seq) - ref_start, 0)
+                    max_diff = self._last_diff(ref_start, alt_start, length) + 1
+                    insertion += self._alt_seq[alt_start:alt_start + max_diff]
+                    deletion += self._ref_seq[ref_start:ref_start + max_diff]
 
                     variants.append({"start": aa_start, "ins": insertion, "del": deletion})
 
@@ -154,6 +156,24 @@ class AltSeqToHgvsp(object):
     # internal methods
     #
 
+    def _last_diff(self, ref_start, alt_start, length, window=4):
+        """Return the index (from the starts) of the last difference
+        between ref_seq[ref_start:ref_start + length] and
+        alt_seq[alt_start:alt_start + length], or -1 if they are equal
+
+        The sequences agree after the codons changed by the variant,
+        so the window is doubled until the sequences agree beyond it,
+        which is checked by string comparison, and only the window is
+        scanned.
+        """
+        while (window < length and self._ref_seq[ref_start + window:ref_start + length] !=
+               self._alt_seq[alt_start + window:alt_start + length]):
+            window *= 2
+        for i in xrange(min(window, length) - 1, -1, -1):
+            if self._ref_seq[ref_start + i] != self._alt_seq[alt_start + i]:
+                return i
+        return -1
+
     def _convert_to_sequence_variants(self, variant, acc):
         """Convert AA variant to an hgvs representation
 
@@ -165,8 +185,8 @@ class AltSeqToHgvsp(object):
         :rtype str
         """
         start = variant['start']
-        insertion = ''.join(variant['ins'])
-        deletion = ''.join(variant['del'])
+        insertion = variant['ins']
+        deletion = variant['del']
 
         # defaults
         is_dup = False    # assume not dup
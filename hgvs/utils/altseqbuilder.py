@@ -11,10 +11,9 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 import math
 import recordtype
 
-from Bio.Seq import Seq
-
 from ..edit import (Dup, NARefAlt, Repeat)
 from ..location import CDS_START, CDS_END
+from .translate import translate_cds
 
 DBG = False
 
@@ -54,16 +53,10 @@ class AltTranscriptData(recordtype.recordtype('AltTranscriptData', [
         :rtype recordtype
         """
         if len(seq) > 0:
-            if isinstance(seq, basestring):
-                seq = list(seq)
-            seq_cds = seq[cds_start - 1:]
-            if len(seq_cds) % 3 != 0:    # padding so biopython won't complain during the conversion
-                seq_cds.extend(['N'] * ((3 - len(seq_cds) % 3) % 3))
-            seq_cds = ''.join(seq_cds)
-            seq_aa = str(Seq(seq_cds).translate())
-            stop_pos = seq_aa.find("*")
-            if stop_pos != -1:
-                seq_aa = seq_aa[:stop_pos + 1]
+            seq_cds = ''.join(seq[cds_start - 1:])
+            if len(seq_cds) % 3 != 0:    # padding so a partial last codon is translated
+                seq_cds += 'N' * ((3 - len(seq_cds) % 3) % 3)
+            seq_aa = translate_cds(seq_cds, to_stop=True)
         else:
             seq_aa = []
 
@@ -80,6 +73,17 @@ class AltTranscriptData(recordtype.recordtype('AltTranscriptData', [
         return alt_data
 
 
+def is_regular_cds(transcript_data):
+    """return True if the reference CDS is whole codons and its
+    translation has exactly one stop, in the last codon; for such
+    transcripts, an in-frame edit that leaves the first and last codons
+    alone changes only the codons it overlaps"""
+    aa_sequence = transcript_data.aa_sequence
+    cds_length = transcript_data.cds_stop - transcript_data.cds_start + 1
+    return (cds_length % 3 == 0 and len(aa_sequence) == cds_length // 3 and aa_sequence[-1:] == "*" and
+            aa_sequence.count("*") == 1)
+
+
 class AltSeqBuilder(object):
 
     EXON = "exon"
@@ -105,6 +109,9 @@ class AltSeqBuilder(object):
         # check reference for special characteristics
         self._ref_has_multiple_stops = self._transcript_data.aa_sequence.count("*") > 1
 
+        # windowed translation (see _create_alt_data) needs a regular reference CDS
+        self._ref_cds_is_regular = is_regular_cds(self._transcript_data)
+
     def build_altseq(self):
         """given a variant and a sequence, incorporate the variant and return the new sequence
 
@@ -210,13 +217,13 @@ class AltSeqBuilder(object):
         # incorporate the variant into the sequence (depending on the type)
         is_substitution = False
         if ref is not None and alt is not None:    # delins or SNP
-            seq[start:end] = list(alt)
+            edit = (start, end, alt)
             if len(ref) == 1 and len(alt) == 1:
                 is_substitution = True
         elif ref is not None:    # deletion
-            del seq[start:end]
+            edit = (start, end, "")
         else:    # insertion
-            seq[start + 1:start + 1] = list(alt)    # insertion in list before python list index
+            edit = (start + 1, start + 1, alt)    # insertion before python index
 
         if DBG:
             print("net base change: {}".format(net_base_change))
@@ -224,14 +231,8 @@ class AltSeqBuilder(object):
         # use max of mod 3 value and 1 (in event that indel starts in the 5'utr range)
         variant_start_aa = max(int(math.ceil((self._var_c.posedit.pos.start.base) / 3.0)), 1)
 
-        alt_data = AltTranscriptData.create_for_variant_inserter(seq,
-                                                                 cds_start,
-                                                                 cds_stop,
-                                                                 is_frameshift,
-                                                                 variant_start_aa,
-                                                                 self._transcript_data.protein_accession,
-                                                                 is_substitution=is_substitution,
-                                                                 is_ambiguous=self._ref_has_multiple_stops)
+        alt_data = self._create_alt_data(seq, edit, cds_start, cds_stop, is_frameshift, variant_start_aa,
+                                         is_substitution=is_substitution)
         return alt_data
 
     def _incorporate_dup(self):
@@ -239,18 +240,67 @@ class AltSeqBuilder(object):
         seq, cds_start, cds_stop, start, end = self._setup_incorporate()
 
         dup_seq = seq[start:end]
-        seq[end:end] = dup_seq
+        edit = (end, end, dup_seq)
 
         is_frameshift = len(dup_seq) % 3 != 0
         variant_start_aa = int(math.ceil((self._var_c.posedit.pos.end.base + 1) / 3.0))
 
-        alt_data = AltTranscriptData.create_for_variant_inserter(seq,
+        alt_data = self._create_alt_data(seq, edit, cds_start, cds_stop, is_frameshift, variant_start_aa)
+        return alt_data
+
+    def _create_alt_data(self, seq, edit, cds_start, cds_stop, is_frameshift, variant_start_aa, is_substitution=False):
+        """Apply an edit to the reference transcript sequence and create the variant sequence data
+
+        An in-frame edit that leaves the start and stop codons alone changes only the codons it
+        overlaps, so only those are translated and spliced into the reference protein; other
+        edits (frameshifts, edits touching the start or stop codon) are translated in full.
+
+        :param seq: reference transcript sequence
+        :type seq: str
+        :param edit: (start, end, alt): seq[start:end] (0-based, python slice) is replaced by alt
+        :type edit: (int, int, str)
+        :return variant sequence data
+        :rtype recordtype
+        """
+        start, end, alt = edit
+        start, end, _ = slice(start, end).indices(len(seq))
+        end = max(start, end)    # as for python list slice assignment
+        alt_seq = seq[:start] + alt + seq[end:]
+
+        cds_begin = self._transcript_data.cds_start - 1    # reference cds, 0-based
+        cds_end = self._transcript_data.cds_stop    # exclusive; the last codon is the stop
+        if (not self._ref_cds_is_regular or (len(alt) - (end - start)) % 3 != 0 or start < cds_begin + 3 or
+                end > cds_end - 3):
+            return AltTranscriptData.create_for_variant_inserter(alt_seq,
                                                                  cds_start,
                                                                  cds_stop,
                                                                  is_frameshift,
                                                                  variant_start_aa,
                                                                  self._transcript_data.protein_accession,
+                                                                 is_substitution=is_substitution,
                                                                  is_ambiguous=self._ref_has_multiple_stops)
+
+        # extend the edit to whole codons and translate just those
+        window_start = start - (start - cds_begin) % 3
+        window_end = end + (cds_begin - end) % 3
+        window_aa = translate_cds(seq[window_start:start] + alt + seq[end:window_end])
+        ref_aa = self._transcript_data.aa_sequence
+        i, j = (window_start - cds_begin) // 3, (window_end - cds_begin) // 3
+        stop_pos = window_aa.find("*")
+        if stop_pos == -1:
+            seq_aa = ref_aa[:i] + window_aa + ref_aa[j:]
+        else:    # truncated at the new stop, as for a full translation
+            seq_aa = ref_aa[:i] + window_aa[:stop_pos + 1]
+
+        alt_data = AltTranscriptData(alt_seq,
+                                     seq_aa,
+                                     cds_start,
+                                     cds_stop,
+                                     self._transcript_data.protein_accession,
+                                     is_frameshift=is_frameshift,
+                                     variant_start_aa=variant_start_aa,
+                                     is_substitution=is_substitution,
+                                     is_ambiguous=self._ref_has_multiple_stops)
         return alt_data
 
     def _incorporate_repeat(self):
@@ -261,9 +311,9 @@ class AltSeqBuilder(object):
         """Helper to setup incorporate functions
         :return (transcript sequence, cds start [1-based], cds stop [1-based],
         cds start index in seq [inc, 0-based], cds end index in seq [excl, 0-based])
-        :rtype (list, int, int, int, int)
+        :rtype (str, int, int, int, int)
         """
-        seq = list(self._transcript_data.transcript_sequence)
+        seq = self._transcript_data.transcript_sequence
 
         # get initial start/end points; will modify these based on the variant length
         cds_start = self._transcript_data.cds_start
@@ -297,6 +347,14 @@ class AltSeqBuilder(object):
 
     def _create_alt_equals_ref_noncds(self):
         """Create an alt seq that matches the reference (for non-cds variants)"""
+        if self._ref_cds_is_regular:
+            # translation from the cds start stops at the reference stop codon
+            return AltTranscriptData(self._transcript_data.transcript_sequence,
+                                     self._transcript_data.aa_sequence,
+                                     self._transcript_data.cds_start,
+                                     self._transcript_data.cds_stop,
+                                     self._transcript_data.protein_accession,
+                                     is_ambiguous=True)
         alt_data = AltTranscriptData.create_for_variant_inserter(
             list(self._transcript_data.transcript_sequence),
             self._transcript_data.cds_start,
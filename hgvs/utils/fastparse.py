@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""Regular-expression front end for the most common HGVS variant shapes
+
+Most variants seen in bulk (e.g., ClinVar, dbSNP) are simple g., c.,
+and n. substitutions, deletions, duplications, insertions, and
+delins with definite positions.  parse_simple_variant recognizes
+exactly those shapes and builds the same objects as the grammar
+would, using the same constructors and argument values.  Anything
+else returns None, in which case the caller must use the grammar.
+
+The patterns are deliberately conservative: every string they accept
+is parsed by the grammar to an equal object (see
+tests/test_hgvs_parser.py).
+
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import re
+
+import hgvs.edit
+import hgvs.location
+import hgvs.posedit
+import hgvs.variant
+
+
+_dna = "[ACGTRYMKWSBDHVNacgtrymkwsbdhvn]"
+
+_accn = r"(?P<ac>[A-Za-z][A-Za-z0-9]+(?:_[A-Za-z0-9]+)?(?:\.[0-9]+)?)"
+
+_edit = (r"(?:(?P<sub_ref>{dna})>(?P<sub_alt>{dna})"
+         r"|del(?P<delins_ref>[0-9]+|{dna}*)ins(?P<delins_alt>{dna}+)"
+         r"|ins(?P<ins_alt>{dna}+)"
+         r"|del(?P<del_ref>[0-9]+|{dna}*)"
+         r"|dup(?P<dup_ref>{dna}*))").format(dna=_dna)
+
+_g_interval = r"(?P<start>[0-9]+)(?:_(?P<end>[0-9]+))?"
+
+_c_pos = r"(?:\*(?P<{p}_end_base>[0-9]+)|(?P<{p}_base>[-+]?[0-9]+))(?P<{p}_offset>[-+][0-9]+)?"
+_c_interval = "{start}(?:_{end})?".format(start=_c_pos.format(p="start"), end=_c_pos.format(p="end"))
+
+_n_pos = r"(?P<{p}_base>[-+]?[0-9]+)(?P<{p}_offset>[-+][0-9]+)?"
+_n_interval = "{start}(?:_{end})?".format(start=_n_pos.format(p="start"), end=_n_pos.format(p="end"))
+
+_variant_res = {
+    "g": re.compile(_accn + r":(?P<type>g)\." + _g_interval + _edit + r"\Z"),
+    "c": re.compile(_accn + r":(?P<type>c)\." + _c_interval + _edit + r"\Z"),
+    "n": re.compile(_accn + r":(?P<type>n)\." + _n_interval + _edit + r"\Z"),
+}
+
+
+def _make_edit(gd):
+    if gd["sub_ref"] is not None:
+        return hgvs.edit.NARefAlt(ref=gd["sub_ref"], alt=gd["sub_alt"])
+    if gd["delins_alt"] is not None:
+        return hgvs.edit.NARefAlt(ref=gd["delins_ref"], alt=gd["delins_alt"])
+    if gd["ins_alt"] is not None:
+        return hgvs.edit.NARefAlt(ref=None, alt=gd["ins_alt"])
+    if gd["del_ref"] is not None:
+        return hgvs.edit.NARefAlt(ref=gd["del_ref"], alt=None)
+    return hgvs.edit.Dup(ref=gd["dup_ref"])
+
+
+def _make_g_interval(gd):
+    start = hgvs.location.SimplePosition(int(gd["start"]))
+    if gd["end"] is None:
+        return hgvs.location.Interval(start, start)
+    return hgvs.location.Interval(start, hgvs.location.SimplePosition(int(gd["end"])))
+
+
+def _make_bo_pos(gd, p, datum):
+    offset = gd[p + "_offset"]
+    offset = 0 if offset is None else int(offset)
+    end_base = gd.get(p + "_end_base")
+    if end_base is not None:
+        return hgvs.location.BaseOffsetPosition(int(end_base), offset, datum=hgvs.location.CDS_END)
+    return hgvs.location.BaseOffsetPosition(int(gd[p + "_base"]), offset, datum=datum)
+
+
+def _make_bo_interval(gd, datum):
+    # as in the grammar, a single position is used as both start and end
+    start = _make_bo_pos(gd, "start", datum)
+    if gd["end_base"] is None and gd.get("end_end_base") is None:
+        return hgvs.location.BaseOffsetInterval(start, start)
+    return hgvs.location.BaseOffsetInterval(start, _make_bo_pos(gd, "end", datum))
+
+
+def _match(s):
+    i = s.find(":")
+    if i < 0 or len(s) < i + 3:
+        return None
+    variant_re = _variant_res.get(s[i + 1])
+    if variant_re is None:
+        return None
+    return variant_re.match(s)
+
+
+def match_simple_variant(s):
+    """return the sequence type (g, c, or n) if s is a simple variant, or
+    None otherwise, without building the variant"""
+    m = _match(s)
+    return None if m is None else m.group("type")
+
+
+def match_simple_variant_groups(s):
+    """return the named groups (a dict) of the pattern matching a simple
+    variant, or None; used to fill columnar structures without
+    building objects (see hgvs.variantbatch)"""
+    m = _match(s)
+    return None if m is None else m.groupdict()
+
+
+def parse_simple_variant(s):
+    """return a SequenceVariant for s if s is a simple g., c., or n.
+    variant, or None otherwise
+
+    >>> print(parse_simple_variant("NM_01234.5:c.22+1A>T"))
+    NM_01234.5:c.22+1A>T
+    >>> parse_simple_variant("NM_01234.5:c.(22+1)A>T") is None
+    True
+
+    """
+    m = _match(s)
+    if m is None:
+        return None
+    gd = m.groupdict()
+    t = gd["type"]
+    if t == "g":
+        pos = _make_g_interval(gd)
+    elif t == "c":
+        pos = _make_bo_interval(gd, hgvs.location.CDS_START)
+    else:
+        pos = _make_bo_interval(gd, hgvs.location.SEQ_START)
+    posedit = hgvs.posedit.PosEdit(pos=pos, edit=_make_edit(gd))
+    return hgvs.variant.SequenceVariant(gd["ac"], gd["type"], posedit)
@@ -9,6 +9,8 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 from collections import namedtuple
 
+_normalized_alleles = namedtuple('shuffled_alleles', 'start stop alleles')
+
 
 def trim_common_suffixes(strs, min_len=0):
     """trim common suffixes"""
@@ -46,13 +48,65 @@ def trim_common_prefixes(strs, min_len=0):
     return trimmed, strs
 
 
+def _is_simple_indel(alleles):
+    """whether alleles are one empty and one non-empty allele"""
+    return len(alleles) == 2 and bool(alleles[0]) != bool(alleles[1])
+
+
+def _repeat_unit(allele):
+    """return the shortest string that allele is a repeat of"""
+    period = (allele + allele).find(allele, 1)
+    return allele[:period]
+
+
+def _repeat_shift_right(ref, pos, allele, bound):
+    """return the number of bases by which an insertion or deletion of
+    allele at ref[pos] can be shifted right without passing bound
+
+    This is the length of the run of ref[pos:bound] that continues the
+    repeat of allele, found by comparing blocks of ref, of doubling
+    length, with the repeat unit of allele.
+    """
+    unit = _repeat_unit(allele)
+    block = unit
+    shift = 0
+    while pos + shift < bound:
+        seq = ref[pos + shift:min(pos + shift + len(block), bound)].upper()
+        if seq != block:
+            for i, c in enumerate(seq):
+                if c != block[i]:
+                    return shift + i
+            return shift + len(seq)
+        shift += len(block)
+        block += block
+    return shift
+
+
+def _repeat_shift_left(ref, pos, allele, bound):
+    """return the number of bases by which an insertion or deletion of
+    allele ending before ref[pos] can be shifted left without passing bound;
+    see _repeat_shift_right
+    """
+    unit = _repeat_unit(allele[::-1])
+    block = unit
+    shift = 0
+    while pos - shift > bound:
+        seq = ref[max(pos - shift - len(block), bound):pos - shift][::-1].upper()
+        if seq != block:
+            for i, c in enumerate(seq):
+                if c != block[i]:
+                    return shift + i
+            return shift + len(seq)
+        shift += len(block)
+        block += block
+    return shift
+
+
 def normalize_alleles_left(ref, start, stop, alleles, bound, ref_step, shuffle=True):
     """Normalize loci by removing extraneous reference padding"""
 
-    normalized_alleles = namedtuple('shuffled_alleles', 'start stop alleles')
-
     if len(alleles) < 2 or start <= 0 or stop <= 0:
-        return normalized_alleles(start, stop, alleles)
+        return _normalized_alleles(start, stop, alleles)
 
     # STEP 1: Trim common suffix
     trimmed, alleles = trim_common_suffixes(alleles)
@@ -66,6 +120,16 @@ def normalize_alleles_left(ref, start, stop, alleles, bound, ref_step, shuffle=T
 
     # STEP 3: While a null allele exists, left shuffle by prepending alleles
     #         with reference and trimming common suffixes
+    if shuffle and _is_simple_indel(alleles) and start > bound >= 0:
+        allele = alleles[0] or alleles[1]
+        shift = _repeat_shift_left(ref, start, allele, bound)
+        if shift:
+            start -= shift
+            stop -= shift
+            allele = (ref[start:start + shift].upper() + allele)[:len(allele)]
+            alleles = ["" if not a else allele for a in alleles]
+        shuffle = False
+
     while shuffle and '' in alleles and start > bound:
         step = min(ref_step, start - bound)
 
@@ -87,18 +151,16 @@ def normalize_alleles_left(ref, start, stop, alleles, bound, ref_step, shuffle=T
             alleles = [a[left:] for a in new_alleles]
             break
 
-    return normalized_alleles(start, stop, tuple(alleles))
+    return _normalized_alleles(start, stop, tuple(alleles))
 
 
 def normalize_alleles_right(ref, start, stop, alleles, bound, ref_step, shuffle=True):
     """Normalize loci by removing extraneous reference padding"""
 
-    normalized_alleles = namedtuple('shuffled_alleles', 'start stop alleles')
-
     chrom_stop = len(ref)
 
     if len(alleles) < 2 or stop >= chrom_stop:
-        return normalized_alleles(start, stop, alleles)
+        return _normalized_alleles(start, stop, alleles)
 
     # STEP 1: Trim common prefix
     trimmed, alleles = trim_common_prefixes(alleles)
@@ -112,6 +174,16 @@ def normalize_alleles_right(ref, start, stop, alleles, bound, ref_step, shuffle=
 
     # STEP 3: While a null allele exists, right shuffle by appending alleles
     #         with reference and trimming common prefixes
+    if shuffle and _is_simple_indel(alleles) and stop < bound <= chrom_stop:
+        allele = alleles[0] or alleles[1]
+        shift = _repeat_shift_right(ref, stop, allele, bound)
+        if shift:
+            allele = (allele + ref[stop:stop + shift].upper())[shift:]
+            start += shift
+            stop += shift
+            alleles = ["" if not a else allele for a in alleles]
+        shuffle = False
+
     while shuffle and '' in alleles and stop < bound:
         step = min(ref_step, bound - stop)
 
@@ -133,7 +205,7 @@ def normalize_alleles_right(ref, start, stop, alleles, bound, ref_step, shuffle=
             alleles = [a[:-left] for a in new_alleles]
             break
 
-    return normalized_alleles(start, stop, tuple(alleles))
+    return _normalized_alleles(start, stop, tuple(alleles))
 
 
 def normalize_alleles(ref, start, stop, alleles, bound, ref_step, left, shuffle=True):
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""Translation of nucleotide sequences with the standard genetic code
+
+translate_cds gives the same result as Bio.Seq.Seq(seq).translate()
+for DNA and RNA in either case, including IUPAC ambiguity codes (see
+tests/test_hgvs_utils_translate.py), without building Seq objects.
+Codons are looked up in a table of the 64 unambiguous codons;
+ambiguous codons are resolved on first use and added to the table.
+
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import itertools
+
+from ..exceptions import HGVSError
+
+_bases = "TCAG"
+_aas = "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG"
+
+_ambiguity_codes = {
+    "A": "A", "C": "C", "G": "G", "T": "T", "U": "T",
+    "R": "AG", "Y": "CT", "S": "CG", "W": "AT", "K": "GT", "M": "AC",
+    "B": "CGT", "D": "AGT", "H": "ACT", "V": "ACG", "N": "ACGT",
+}
+
+# ambiguous amino acid codes, as used by Biopython
+_ambiguous_aas = {
+    frozenset("DN"): "B",
+    frozenset("EQ"): "Z",
+    frozenset("IL"): "J",
+}
+
+# codons are translated in chunks of this many bases when stopping at
+# the first stop codon
+_chunk_size = 3 * 100
+
+
+def _translate_codon(codon):
+    """translate one codon, which may contain ambiguity codes"""
+    try:
+        expansions = [_ambiguity_codes[b] for b in codon.upper()]
+    except KeyError:
+        raise HGVSError("Codon '{}' is invalid".format(codon))
+    if len(expansions) != 3:
+        raise HGVSError("Codon '{}' is invalid".format(codon))
+    aas = frozenset(_codon_table["".join(c)] for c in itertools.product(*expansions))
+    if len(aas) == 1:
+        return next(iter(aas))
+    return _ambiguous_aas.get(aas, "X")
+
+
+class _CodonTable(dict):
+    """codon to amino acid map that resolves missing codons as needed"""
+
+    def __missing__(self, codon):
+        aa = _translate_codon(codon)
+        self[codon] = aa
+        return aa
+
+
+_codon_table = _CodonTable(("".join(c), aa) for c, aa in zip(itertools.product(_bases, repeat=3), _aas))
+
+
+def translate_cds(seq, to_stop=False):
+    """translate a nucleotide sequence to a string of 1-letter amino
+    acids with the standard genetic code
+
+    Stop codons are translated as "*".  With to_stop, translation ends
+    at the first stop codon, which is included in the result.  As for
+    Biopython, a trailing partial codon is ignored; callers pad
+    sequences with N as needed.
+
+    >>> print(translate_cds("ATGGCNTAYTAGCCC"))
+    MAY*P
+    >>> print(translate_cds("ATGGCNTAYTAGCCC", to_stop=True))
+    MAY*
+
+    """
+    end = len(seq) - len(seq) % 3
+    if not to_stop:
+        return "".join([_codon_table[seq[i:i + 3]] for i in xrange(0, end, 3)])
+    chunks = []
+    for chunk_start in xrange(0, end, _chunk_size):
+        chunk_end = min(chunk_start + _chunk_size, end)
+        aa = "".join([_codon_table[seq[i:i + 3]] for i in xrange(chunk_start, chunk_end, 3)])
+        stop_pos = aa.find("*")
+        if stop_pos != -1:
+            chunks.append(aa[:stop_pos + 1])
+            break
+        chunks.append(aa)
+    return "".join(chunks)
+
+# <LICENSE>
+# Copyright 2013-2015 HGVS Contributors (https://bitbucket.org/biocommons/hgvs)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# </LICENSE>
@@ -7,16 +7,18 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 import recordtype
 
-import hgvs.variantmapper
+import hgvs.utils
 
 
-class SequenceVariant(recordtype.recordtype("SequenceVariant", ["ac", "type", "posedit"])):
+class SequenceVariant(hgvs.utils.CloneMixin, recordtype.recordtype("SequenceVariant", ["ac", "type", "posedit"])):
     """
     represents a basic HGVS variant.  The only requirement is that each
     component can be stringified; for example, passing pos as either a string
     or an hgvs.location.CDSInterval (for example) are both intended uses
     """
 
+    __slots__ = ()
+
     def format(self, conf=None):
         """Formatting the stringification of sequence variants
 
@@ -33,6 +35,7 @@ class SequenceVariant(recordtype.recordtype("SequenceVariant", ["ac", "type", "p
     __str__ = format
 
     def fill_ref(self, hdp):
+        import hgvs.variantmapper
         hm = hgvs.variantmapper.VariantMapper(hdp)
         type = self.posedit.edit.type
         if type in ["del", "delins", "identity", "dup", "inv"] and self.posedit.edit.ref_s is None:
@@ -41,6 +44,99 @@ class SequenceVariant(recordtype.recordtype("SequenceVariant", ["ac", "type", "p
             self.posedit.edit.alt = self.posedit.edit.ref
         return self
 
+    def freeze(self):
+        """return an immutable, hashable FrozenSequenceVariant equal in
+        structure to this variant; see FrozenSequenceVariant"""
+        return FrozenSequenceVariant(self)
+
+
+class FrozenSequenceVariant(object):
+    """
+    immutable, hashable snapshot of a SequenceVariant, for use in sets
+    and as dict keys (e.g., to deduplicate or join large batches of
+    variants without formatting them)
+
+    Two frozen variants are equal when their model objects have the
+    same classes and field values, all the way down; the hash is
+    computed once, when the variant is frozen.  Later changes to the
+    original variant do not affect the frozen one.
+
+    >>> import hgvs.parser
+    >>> hp = hgvs.parser.Parser()
+    >>> v1 = hp.parse_hgvs_variant("NM_01234.5:c.22+1A>T").freeze()
+    >>> v2 = hp.parse_hgvs_variant("NM_01234.5:c.22+1A>T").freeze()
+    >>> v1 == v2, len({v1, v2})
+    (True, 1)
+    >>> print(v1.thaw())
+    NM_01234.5:c.22+1A>T
+    """
+
+    __slots__ = ("_key", "_hash")
+
+    def __init__(self, var):
+        self._key = _freeze(var)
+        self._hash = hash(self._key)
+
+    @property
+    def ac(self):
+        return self._key[1][0]
+
+    @property
+    def type(self):
+        return self._key[1][1]
+
+    def thaw(self):
+        """return a new, mutable SequenceVariant equal to the frozen one"""
+        return _thaw(self._key)
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, FrozenSequenceVariant):
+            return NotImplemented
+        return self._hash == other._hash and self._key == other._key
+
+    def __ne__(self, other):
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else not eq
+
+    def __getstate__(self):
+        return self._key
+
+    def __setstate__(self, key):
+        self._key = key
+        self._hash = hash(key)
+
+    def __repr__(self):
+        return "FrozenSequenceVariant({!r})".format(self.thaw())
+
+    def __str__(self):
+        return str(self.thaw())
+
+
+def _freeze(obj):
+    """return a hashable (class, field values) key for a recordtype-based
+    model object, recursively; other values are returned as is"""
+    getstate = getattr(obj, "__getstate__", None)
+    if getstate is None:
+        return obj
+    atomic_types = hgvs.utils.atomic_types
+    return (type(obj), tuple([v if type(v) in atomic_types else _freeze(v) for v in getstate()]))
+
+
+def _thaw(key):
+    """inverse of _freeze; objects are rebuilt without calling __init__,
+    because the stored field values are already in canonical form"""
+    if type(key) is tuple and len(key) == 2 and isinstance(key[0], type):
+        cls, values = key
+        obj = cls.__new__(cls)
+        obj.__setstate__(tuple(_thaw(v) for v in values))
+        return obj
+    return key
+
 
 # <LICENSE>
 # Copyright 2013-2015 HGVS Contributors (https://bitbucket.org/biocommons/hgvs)
@@ -0,0 +1,380 @@
+# -*- coding: utf-8 -*-
+"""columnar representation of many simple genomic variants
+
+A VariantBatch holds simple g. (or m.) variants -- substitutions,
+identities, deletions, insertions, delins, and duplications at
+definite positions -- as a struct of arrays instead of one
+SequenceVariant object graph per variant:
+
+* `acs` lists the distinct accessions, and `ac_ids` indexes it
+* `starts` and `ends` are 1-based, inclusive positions
+* `edit_types` holds one of the EDIT_* codes below
+* reference and alternate sequences are packed into two byte strings,
+  `ref_buf` and `alt_buf`, delimited by `ref_offsets` and `alt_offsets`
+  (the sequence for row i is buf[offsets[i]:offsets[i+1]])
+
+Batches are built from VCF columns, HGVS strings, or variants.
+Variants and HGVS strings are produced only on demand, and formatting
+does not build any objects.  VariantMapper.g_to_c_batch maps a batch
+to c. positions with the array-based TranscriptMapper methods.
+
+VariantBatch requires NumPy.
+
+>>> batch = VariantBatch.from_vcf(["NC_000007.13", "NC_000007.13"], [36561662, 36561670], ["C", "TA"], ["T", "T"])
+>>> len(batch)
+2
+>>> batch.starts
+array([36561662, 36561671])
+>>> [batch.format(i) for i in range(len(batch))]
+[u'NC_000007.13:g.36561662C>T', u'NC_000007.13:g.36561671delA']
+>>> var = batch[0]
+>>> type(var).__name__
+'SequenceVariant'
+>>> print(var)
+NC_000007.13:g.36561662C>T
+
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import numpy as np
+
+import hgvs.edit
+import hgvs.location
+import hgvs.parser
+import hgvs.posedit
+import hgvs.utils.fastparse
+import hgvs.variant
+from hgvs.exceptions import HGVSUnsupportedOperationError, HGVSUsageError
+
+# edit type codes, which determine which sequences are meaningful
+EDIT_REFALT = 0    # NARefAlt with ref and alt (substitution, identity, delins)
+EDIT_DEL = 1    # NARefAlt with ref only
+EDIT_INS = 2    # NARefAlt with alt only
+EDIT_DUP = 3    # Dup with ref
+
+_vcf_alt_bases = frozenset("ACGTN")
+
+
+class VariantBatch(object):
+    """columnar batch of simple g. or m. variants; see module docstring"""
+
+    def __init__(self, type, acs, ac_ids, starts, ends, edit_types, ref_buf, ref_offsets, alt_buf, alt_offsets):
+        n = len(ac_ids)
+        if not (len(starts) == len(ends) == len(edit_types) == len(ref_offsets) - 1 == len(alt_offsets) - 1 == n):
+            raise HGVSUsageError("VariantBatch columns must have the same length")
+        self.type = type
+        self.acs = list(acs)
+        self.ac_ids = np.asarray(ac_ids, dtype=np.int32)
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.ends = np.asarray(ends, dtype=np.int64)
+        self.edit_types = np.asarray(edit_types, dtype=np.int8)
+        self.ref_buf = ref_buf
+        self.ref_offsets = np.asarray(ref_offsets, dtype=np.int64)
+        self.alt_buf = alt_buf
+        self.alt_offsets = np.asarray(alt_offsets, dtype=np.int64)
+
+    @classmethod
+    def from_vcf(cls, chroms, positions, refs, alts, ac_map=None):
+        """build a g. batch from VCF CHROM, POS, REF, and ALT columns
+
+        :param ac_map: optional dict mapping CHROM values to sequence accessions; without it, CHROM is used as
+            the accession
+        :raises HGVSUsageError: if a CHROM value is not in ac_map
+        :raises HGVSUnsupportedOperationError: for symbolic, missing, or multiple ALT alleles
+
+        Each row must have a single ALT allele.  Bases shared by REF
+        and ALT are trimmed from the left and then from the right;
+        variants are not otherwise normalized (see hgvs.normalizer).
+
+        """
+        builder = _BatchBuilder("g")
+        for chrom, pos, ref, alt in zip(chroms, positions, refs, alts):
+            if ac_map is not None:
+                try:
+                    chrom = ac_map[chrom]
+                except KeyError:
+                    raise HGVSUsageError("No accession for chromosome {chrom}".format(chrom=chrom))
+            builder.add_vcf(chrom, int(pos), ref.upper(), alt.upper())
+        return builder.build(cls)
+
+    @classmethod
+    def from_strings(cls, hgvs_strings, parser=None):
+        """build a batch from HGVS strings, which must all be simple
+        variants of the same type (g. or m.)
+
+        Strings matched by the parser's fast path are read directly
+        into the columns; others are parsed with `parser` (a
+        hgvs.parser.Parser, created if needed) and added as variants.
+
+        :raises HGVSParseError: if a string cannot be parsed
+        :raises HGVSUnsupportedOperationError: if a variant cannot be represented in a batch
+
+        """
+        builder = _BatchBuilder()
+        for s in hgvs_strings:
+            gd = hgvs.utils.fastparse.match_simple_variant_groups(s)
+            if gd is not None and gd["type"] == "g":
+                builder.add_groups(gd)
+                continue
+            if parser is None:
+                parser = hgvs.parser.Parser()
+            builder.add_variant(parser.parse_hgvs_variant(s))
+        return builder.build(cls)
+
+    @classmethod
+    def from_variants(cls, variants):
+        """build a batch from SequenceVariants, which must all be simple
+        variants of the same type (g. or m.)
+
+        :raises HGVSUnsupportedOperationError: if a variant cannot be represented in a batch
+
+        """
+        builder = _BatchBuilder()
+        for var in variants:
+            builder.add_variant(var)
+        return builder.build(cls)
+
+    def __len__(self):
+        return len(self.ac_ids)
+
+    def _index(self, i):
+        """return row index i as a non-negative index, counting from the
+        end if negative"""
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("VariantBatch index out of range")
+        return i
+
+    def ac(self, i):
+        return self.acs[self.ac_ids[self._index(i)]]
+
+    def ref(self, i):
+        """return the reference sequence for row i, or None for insertions"""
+        i = self._index(i)
+        return _ref(self.edit_types[i], self.ref_buf, self.ref_offsets[i], self.ref_offsets[i + 1])
+
+    def alt(self, i):
+        """return the alternate sequence for row i, or None for deletions and duplications"""
+        i = self._index(i)
+        return _alt(self.edit_types[i], self.alt_buf, self.alt_offsets[i], self.alt_offsets[i + 1])
+
+    def _row(self, i):
+        i = self._index(i)
+        return (self.ac(i), int(self.starts[i]), int(self.ends[i]), self.edit_types[i], self.ref(i), self.alt(i))
+
+    def _rows(self):
+        """generate (ac, start, end, edit type, ref, alt) for each row, using
+        Python values (indexing NumPy arrays element by element is slow)"""
+        acs, ref_buf, alt_buf = self.acs, self.ref_buf, self.alt_buf
+        ref_offsets, alt_offsets = self.ref_offsets.tolist(), self.alt_offsets.tolist()
+        columns = zip(self.ac_ids.tolist(), self.starts.tolist(), self.ends.tolist(), self.edit_types.tolist())
+        for i, (ac_id, start, end, edit_type) in enumerate(columns):
+            yield (acs[ac_id], start, end, edit_type, _ref(edit_type, ref_buf, ref_offsets[i], ref_offsets[i + 1]),
+                   _alt(edit_type, alt_buf, alt_offsets[i], alt_offsets[i + 1]))
+
+    def format(self, i):
+        """return the HGVS string for row i, as str(self[i]) would, without
+        building the variant"""
+        return _format(self.type, *self._row(i))
+
+    def formatted(self):
+        """generate the HGVS string for each row"""
+        for row in self._rows():
+            yield _format(self.type, *row)
+
+    def __getitem__(self, i):
+        """return row i as a new SequenceVariant"""
+        return _make_variant(self.type, *self._row(i))
+
+    def variants(self):
+        """generate a new SequenceVariant for each row"""
+        for row in self._rows():
+            yield _make_variant(self.type, *row)
+
+    def rows_for_ac(self, ac):
+        """return the indexes of the rows on accession ac"""
+        try:
+            ac_id = self.acs.index(ac)
+        except ValueError:
+            return np.zeros(0, dtype=np.intp)
+        return np.flatnonzero(self.ac_ids == ac_id)
+
+    def take(self, indexes):
+        """return a new batch of the rows at indexes (e.g., from rows_for_ac)"""
+        indexes = np.asarray(indexes, dtype=np.intp)
+        ref_buf, ref_offsets = _take_packed(self.ref_buf, self.ref_offsets, indexes)
+        alt_buf, alt_offsets = _take_packed(self.alt_buf, self.alt_offsets, indexes)
+        return type(self)(self.type, self.acs, self.ac_ids[indexes], self.starts[indexes], self.ends[indexes],
+                          self.edit_types[indexes], ref_buf, ref_offsets, alt_buf, alt_offsets)
+
+    def __repr__(self):
+        return "{cls}(type={self.type}, n={n}, acs={n_acs})".format(cls=type(self).__name__, self=self, n=len(self),
+                                                                    n_acs=len(self.acs))
+
+
+def _ref(edit_type, buf, start_i, end_i):
+    return None if edit_type == EDIT_INS else buf[start_i:end_i].decode("ascii")
+
+
+def _alt(edit_type, buf, start_i, end_i):
+    return None if edit_type == EDIT_DEL or edit_type == EDIT_DUP else buf[start_i:end_i].decode("ascii")
+
+
+def _format(type, ac, start, end, edit_type, ref, alt):
+    # mirrors SequenceVariant, Interval, and NARefAlt/Dup formatting
+    pos = str(start) if start == end else "{start}_{end}".format(start=start, end=end)
+    if edit_type == EDIT_REFALT:
+        if ref == alt:
+            edit = ref + "="
+        elif len(ref) == 1 and len(alt) == 1 and not ref.isdigit():
+            edit = ref + ">" + alt
+        else:
+            edit = "del" + ref + "ins" + alt
+    elif edit_type == EDIT_DEL:
+        edit = "del" + ref
+    elif edit_type == EDIT_INS:
+        edit = "ins" + alt
+    else:
+        edit = "dup" + ref
+    return ac + ":" + type + "." + pos + edit
+
+
+def _make_variant(type, ac, start, end, edit_type, ref, alt):
+    start_pos = hgvs.location.SimplePosition(base=start)
+    end_pos = start_pos if end == start else hgvs.location.SimplePosition(base=end)
+    if edit_type == EDIT_DUP:
+        edit = hgvs.edit.Dup(ref=ref)
+    else:
+        edit = hgvs.edit.NARefAlt(ref=ref, alt=alt)
+    posedit = hgvs.posedit.PosEdit(pos=hgvs.location.Interval(start=start_pos, end=end_pos), edit=edit)
+    return hgvs.variant.SequenceVariant(ac=ac, type=type, posedit=posedit)
+
+
+def _take_packed(buf, offsets, indexes):
+    pieces = [buf[offsets[i]:offsets[i + 1]] for i in indexes]
+    return b"".join(pieces), _offsets([len(p) for p in pieces])
+
+
+def _offsets(lengths):
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets
+
+
+class _BatchBuilder(object):
+    """accumulates rows in lists and converts them to arrays once"""
+
+    def __init__(self, type=None):
+        self.type = type
+        self.ac_index = {}
+        self.ac_ids = []
+        self.starts = []
+        self.ends = []
+        self.edit_types = []
+        self.refs = []
+        self.alts = []
+
+    def _check_type(self, type):
+        if self.type is None:
+            if type not in ("g", "m"):
+                raise HGVSUnsupportedOperationError("VariantBatch supports only g. and m. variants")
+            self.type = type
+        elif type != self.type:
+            raise HGVSUsageError("VariantBatch variants must all be of one type ({} != {})".format(type, self.type))
+
+    def add(self, ac, start, end, edit_type, ref, alt):
+        ac_id = self.ac_index.get(ac)
+        if ac_id is None:
+            ac_id = self.ac_index[ac] = len(self.ac_index)
+        self.ac_ids.append(ac_id)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.edit_types.append(edit_type)
+        self.refs.append(ref.encode("ascii") if ref else b"")
+        self.alts.append(alt.encode("ascii") if alt else b"")
+
+    def add_vcf(self, ac, pos, ref, alt):
+        if not alt or not _vcf_alt_bases.issuperset(alt) or not _vcf_alt_bases.issuperset(ref):
+            raise HGVSUnsupportedOperationError("Unsupported VCF alleles {ref}/{alt} at {ac}:{pos}".format(
+                ref=ref, alt=alt, ac=ac, pos=pos))
+        if ref == alt:
+            self.add(ac, pos, pos + len(ref) - 1, EDIT_REFALT, ref, alt)
+            return
+        n = 0
+        while n < len(ref) and n < len(alt) and ref[n] == alt[n]:
+            n += 1
+        ref, alt, pos = ref[n:], alt[n:], pos + n
+        n = 0
+        while n < len(ref) and n < len(alt) and ref[-1 - n] == alt[-1 - n]:
+            n += 1
+        if n:
+            ref, alt = ref[:-n], alt[:-n]
+        if not ref:
+            self.add(ac, pos - 1, pos, EDIT_INS, None, alt)
+        elif not alt:
+            self.add(ac, pos, pos + len(ref) - 1, EDIT_DEL, ref, None)
+        else:
+            self.add(ac, pos, pos + len(ref) - 1, EDIT_REFALT, ref, alt)
+
+    def add_groups(self, gd):
+        """add a g. variant from hgvs.utils.fastparse.match_simple_variant_groups"""
+        self._check_type(gd["type"])
+        start = int(gd["start"])
+        end = start if gd["end"] is None else int(gd["end"])
+        if gd["sub_ref"] is not None:
+            self.add(gd["ac"], start, end, EDIT_REFALT, gd["sub_ref"], gd["sub_alt"])
+        elif gd["delins_alt"] is not None:
+            self.add(gd["ac"], start, end, EDIT_REFALT, gd["delins_ref"], gd["delins_alt"])
+        elif gd["ins_alt"] is not None:
+            self.add(gd["ac"], start, end, EDIT_INS, None, gd["ins_alt"])
+        elif gd["del_ref"] is not None:
+            self.add(gd["ac"], start, end, EDIT_DEL, gd["del_ref"], None)
+        else:
+            self.add(gd["ac"], start, end, EDIT_DUP, gd["dup_ref"], None)
+
+    def add_variant(self, var):
+        self._check_type(var.type)
+        posedit = var.posedit
+        pos, edit = posedit.pos, posedit.edit
+        start, end = pos.start, pos.end if pos.end is not None else pos.start
+        if (posedit.uncertain or type(pos) is not hgvs.location.Interval or pos.uncertain or
+                type(start) is not hgvs.location.SimplePosition or start.uncertain or start.base is None or
+                type(end) is not hgvs.location.SimplePosition or end.uncertain or end.base is None or
+                type(edit) not in (hgvs.edit.NARefAlt, hgvs.edit.Dup) or edit.uncertain):
+            raise HGVSUnsupportedOperationError("VariantBatch cannot represent {var}".format(var=var))
+        ref = None if edit.ref is None else "{}".format(edit.ref)
+        if type(edit) is hgvs.edit.Dup:
+            self.add(var.ac, start.base, end.base, EDIT_DUP, ref, None)
+        elif edit.ref is None:
+            self.add(var.ac, start.base, end.base, EDIT_INS, None, edit.alt)
+        elif edit.alt is None:
+            self.add(var.ac, start.base, end.base, EDIT_DEL, ref, None)
+        else:
+            self.add(var.ac, start.base, end.base, EDIT_REFALT, ref, edit.alt)
+
+    def build(self, cls):
+        """return a batch of class cls (VariantBatch or a subclass) with the added rows"""
+        acs = sorted(self.ac_index, key=self.ac_index.get)
+        return cls(self.type or "g", acs, self.ac_ids, self.starts, self.ends, self.edit_types,
+                   b"".join(self.refs), _offsets([len(r) for r in self.refs]),
+                   b"".join(self.alts), _offsets([len(a) for a in self.alts]))
+
+
+# <LICENSE>
+# Copyright 2013-2015 HGVS Contributors (https://bitbucket.org/biocommons/hgvs)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# </LICENSE>
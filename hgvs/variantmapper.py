@@ -6,10 +6,8 @@ between sequences using TranscriptMapper.
 
 from __future__ import absolute_import, division, print_function, unicode_literals
 
-import copy
 import logging
 
-from Bio.Seq import Seq
 from bioutils.sequences import reverse_complement
 import recordtype
 
@@ -23,12 +21,46 @@ import hgvs.utils.altseqbuilder as altseqbuilder
 import hgvs.variant
 import hgvs.validator
 
-from hgvs.exceptions import HGVSError, HGVSDataNotAvailableError, HGVSUnsupportedOperationError, HGVSInvalidVariantError
 from hgvs.decorators.lru_cache import lru_cache
+from hgvs.exceptions import HGVSError, HGVSDataNotAvailableError, HGVSUnsupportedOperationError, HGVSInvalidVariantError
+from hgvs.utils.translate import translate_cds
 
 _logger = logging.getLogger(__name__)
 
 
+class RefTranscriptData(recordtype.recordtype("RefTranscriptData",
+                                              ["transcript_sequence", "aa_sequence", "cds_start", "cds_stop",
+                                               "protein_accession"])):
+    """reference transcript data for c_to_p; instances are cached and
+    shared, and must not be modified"""
+
+    @classmethod
+    def setup_transcript_data(cls, hdp, tx_ac, pro_ac):
+        """helper for generating RefTranscriptData from for c_to_p"""
+        tx_info = hdp.get_tx_identity_info(tx_ac)
+        tx_seq = hdp.get_seq(tx_ac)
+
+        if tx_info is None or tx_seq is None:
+            raise HGVSDataNotAvailableError("Missing transcript data for accession: {}".format(tx_ac))
+
+        # use 1-based hgvs coords
+        cds_start = tx_info["cds_start_i"] + 1
+        cds_stop = tx_info["cds_end_i"]
+
+        # padding so a partial last codon is translated
+        tx_seq_to_translate = tx_seq[cds_start - 1:cds_stop]
+        if len(tx_seq_to_translate) % 3 != 0:
+            tx_seq_to_translate += "N" * ((3 - len(tx_seq_to_translate) % 3) % 3)
+
+        protein_seq = translate_cds(tx_seq_to_translate)
+
+        if pro_ac is None:
+            # get_acs... will always return at least the MD5_ accession
+            pro_ac = (hdp.get_pro_ac_for_tx_ac(tx_ac) or hdp.get_acs_for_protein_seq(protein_seq)[0])
+
+        return cls(tx_seq, protein_seq, cds_start, cds_stop, pro_ac)
+
+
 class VariantMapper(object):
     """Maps SequenceVariant objects between g., n., r., c., and p. representations.
 
@@ -78,6 +110,10 @@ class VariantMapper(object):
 
         self.hdp = hdp
         self.replace_reference = replace_reference
+        self.tm_registry = hgvs.transcriptmapper.TranscriptMapperRegistry.for_hdp(hdp)
+        # config values are strings
+        self._fetch_RefTranscriptData = lru_cache(maxsize=int(hgvs.global_config.lru_cache.maxsize))(
+            self._fetch_RefTranscriptData)
 
 
     # ############################################################################
@@ -177,6 +213,34 @@ class VariantMapper(object):
             self._replace_reference(var_c)
         return var_c
 
+    def g_to_c_batch(self, batch, tx_ac, alt_ac, alt_aln_method=hgvs.global_config.mapping.alt_aln_method):
+        """Map the positions of the variants in a g. VariantBatch that are
+        on alt_ac to c. positions on the specified transcript; the batch
+        form of the position mapping in g_to_c.  Requires NumPy.
+
+        :param hgvs.variantbatch.VariantBatch batch: a g. batch
+        :param str tx_ac: a transcript accession (e.g., NM_012345.6 or ENST012345678)
+        :param str alt_ac: the reference sequence accession of the rows to map (e.g., NC_000001.10)
+        :param str alt_aln_method: the alignment method; valid values depend on data source
+        :returns: tuple (rows, starts, ends): rows is an array of the indexes of the mapped rows
+            (see VariantBatch.rows_for_ac and take); starts and ends are tuples of arrays
+            (c. bases, c. offsets, c. datums) for the start and end of the c. interval of each row,
+            as in the variant returned by g_to_c
+        :raises HGVSInvalidVariantError: if batch is not of type "g"
+
+        """
+
+        if not (batch.type == "g"):
+            raise HGVSInvalidVariantError("Expected a g. batch; got " + repr(batch))
+
+        tm = self._fetch_TranscriptMapper(tx_ac=tx_ac, alt_ac=alt_ac, alt_aln_method=alt_aln_method)
+        rows = batch.rows_for_ac(alt_ac)
+        starts = tm.g_to_c_many(batch.starts[rows])
+        ends = tm.g_to_c_many(batch.ends[rows])
+        if tm.strand == -1:
+            starts, ends = ends, starts
+        return rows, starts, ends
+
     def c_to_g(self, var_c, alt_ac, alt_aln_method=hgvs.global_config.mapping.alt_aln_method):
         """Given a parsed c. variant, return a g. variant on the specified
         transcript using the specified alignment method (default is
@@ -222,7 +286,7 @@ class VariantMapper(object):
         pos_n = tm.c_to_n(var_c.posedit.pos)
         if (isinstance(var_c.posedit.edit, hgvs.edit.NARefAlt) or isinstance(var_c.posedit.edit, hgvs.edit.Dup) or
                 isinstance(var_c.posedit.edit, hgvs.edit.Inv)):
-            edit_n = copy.deepcopy(var_c.posedit.edit)
+            edit_n = var_c.posedit.edit.clone()
         else:
             raise HGVSUnsupportedOperationError("Only NARefAlt/Dup/Inv types are currently implemented")
         var_n = hgvs.variant.SequenceVariant(ac=var_c.ac, type="n", posedit=hgvs.posedit.PosEdit(pos_n, edit_n))
@@ -247,7 +311,7 @@ class VariantMapper(object):
         pos_c = tm.n_to_c(var_n.posedit.pos)
         if (isinstance(var_n.posedit.edit, hgvs.edit.NARefAlt) or isinstance(var_n.posedit.edit, hgvs.edit.Dup) or
                 isinstance(var_n.posedit.edit, hgvs.edit.Inv)):
-            edit_c = copy.deepcopy(var_n.posedit.edit)
+            edit_c = var_n.posedit.edit.clone()
         else:
             raise HGVSUnsupportedOperationError("Only NARefAlt/Dup/Inv types are currently implemented")
         var_c = hgvs.variant.SequenceVariant(ac=var_n.ac, type="c", posedit=hgvs.posedit.PosEdit(pos_c, edit_c))
@@ -268,42 +332,10 @@ class VariantMapper(object):
 
         """
 
-        class RefTranscriptData(recordtype.recordtype("RefTranscriptData",
-                                                      ["transcript_sequence", "aa_sequence", "cds_start", "cds_stop",
-                                                       "protein_accession"])):
-            @classmethod
-            def setup_transcript_data(cls, hdp, tx_ac, pro_ac):
-                """helper for generating RefTranscriptData from for c_to_p"""
-                tx_info = hdp.get_tx_identity_info(var_c.ac)
-                tx_seq = hdp.get_seq(tx_ac)
-
-                if tx_info is None or tx_seq is None:
-                    raise HGVSDataNotAvailableError("Missing transcript data for accession: {}".format(tx_ac))
-
-                # use 1-based hgvs coords
-                cds_start = tx_info["cds_start_i"] + 1
-                cds_stop = tx_info["cds_end_i"]
-
-                # padding list so biopython won't complain during the conversion
-                tx_seq_to_translate = tx_seq[cds_start - 1:cds_stop]
-                if len(tx_seq_to_translate) % 3 != 0:
-                    "".join(list(tx_seq_to_translate).extend(["N"] * ((3 - len(tx_seq_to_translate) % 3) % 3)))
-
-                tx_seq_cds = Seq(tx_seq_to_translate)
-                protein_seq = str(tx_seq_cds.translate())
-
-                if pro_ac is None:
-                    # get_acs... will always return at least the MD5_ accession
-                    pro_ac = (hdp.get_pro_ac_for_tx_ac(tx_ac) or hdp.get_acs_for_protein_seq(protein_seq)[0])
-
-                transcript_data = RefTranscriptData(tx_seq, protein_seq, cds_start, cds_stop, pro_ac)
-
-                return transcript_data
-
         if not (var_c.type == "c"):
             raise HGVSInvalidVariantError("Expected a cDNA (c.); got " + str(var_c))
 
-        reference_data = RefTranscriptData.setup_transcript_data(self.hdp, var_c.ac, pro_ac)
+        reference_data = self._fetch_RefTranscriptData(var_c.ac, pro_ac)
         builder = altseqbuilder.AltSeqBuilder(var_c, reference_data)
 
         # TODO: handle case where you get 2+ alt sequences back;
@@ -321,6 +353,41 @@ class VariantMapper(object):
 
         return var_p
 
+    def c_to_p_many(self, var_cs, pro_ac=None):
+        """
+        Converts c. SequenceVariants to p. SequenceVariants; equivalent to
+        [self.c_to_p(var_c, pro_ac) for var_c in var_cs]
+
+        Variants are converted in groups by transcript, so that the
+        reference transcript data (sequence, translation, CDS bounds,
+        and protein accession) is fetched and built once per
+        transcript.
+
+        :param var_cs: iterable of c. SequenceVariants
+        :param str pro_ac: protein accession, or None to use the one for each transcript
+        :returns: list of p. SequenceVariants, in the order of var_cs
+
+        """
+        var_cs = list(var_cs)
+        var_ps = [None] * len(var_cs)
+        for i in sorted(range(len(var_cs)), key=lambda i: var_cs[i].ac):
+            var_ps[i] = VariantMapper.c_to_p(self, var_cs[i], pro_ac)
+        return var_ps
+
+    def saturation_table(self, tx_ac, pro_ac=None):
+        """
+        Returns a SaturationTable of the p. consequences of every
+        substitution in the CDS of a coding transcript; lookups return
+        the same p. SequenceVariants as c_to_p (requires NumPy)
+
+        :param str tx_ac: coding transcript accession
+        :param str pro_ac: protein accession, or None to use the one for the transcript
+        :rtype: hgvs.saturationtable.SaturationTable
+
+        """
+        import hgvs.saturationtable
+        return hgvs.saturationtable.SaturationTable(self, tx_ac, pro_ac)
+
     ############################################################################
     # Internal methods
 
@@ -358,16 +425,19 @@ class VariantMapper(object):
 
         return var
 
-    @lru_cache(maxsize=hgvs.global_config.lru_cache.maxsize)
+    def _fetch_RefTranscriptData(self, tx_ac, pro_ac):
+        """
+        Get RefTranscriptData for the given transcript accession (ac)
+        and protein accession; cached per instance (see __init__).
+        """
+        return RefTranscriptData.setup_transcript_data(self.hdp, tx_ac, pro_ac)
+
     def _fetch_TranscriptMapper(self, tx_ac, alt_ac, alt_aln_method):
         """
-        Get a new TranscriptMapper for the given transcript accession (ac),
-        possibly caching the result.
+        Get a TranscriptMapper for the given transcript accession (ac)
+        from the data provider's shared TranscriptMapperRegistry.
         """
-        return hgvs.transcriptmapper.TranscriptMapper(self.hdp,
-                                                      tx_ac=tx_ac,
-                                                      alt_ac=alt_ac,
-                                                      alt_aln_method=alt_aln_method)
+        return self.tm_registry.get(tx_ac, alt_ac, alt_aln_method)
 
     @staticmethod
     def _convert_edit_check_strand(strand, edit_in):
@@ -376,7 +446,7 @@ class VariantMapper(object):
         """
         if isinstance(edit_in, hgvs.edit.NARefAlt):
             if strand == 1:
-                edit_out = copy.deepcopy(edit_in)
+                edit_out = edit_in.clone()
             else:
                 try:
                     # if smells like an int, do nothing
@@ -388,12 +458,12 @@ class VariantMapper(object):
                 edit_out = hgvs.edit.NARefAlt(ref=ref, alt=reverse_complement(edit_in.alt), )
         elif isinstance(edit_in, hgvs.edit.Dup):
             if strand == 1:
-                edit_out = copy.deepcopy(edit_in)
+                edit_out = edit_in.clone()
             else:
                 edit_out = hgvs.edit.Dup(ref=reverse_complement(edit_in.ref))
         elif isinstance(edit_in, hgvs.edit.Inv):
             if strand == 1:
-                edit_out = copy.deepcopy(edit_in)
+                edit_out = edit_in.clone()
             else:
                 try:
                     int(edit_in.ref)
@@ -520,6 +590,13 @@ class EasyVariantMapper(VariantMapper):
         var_out = super(EasyVariantMapper, self).c_to_p(var_c)
         return self._maybe_normalize(var_out)
 
+    def c_to_p_many(self, var_cs):
+        var_cs = list(var_cs)
+        for var_c in var_cs:
+            self._validator.validate(var_c)
+        var_outs = super(EasyVariantMapper, self).c_to_p_many(var_cs)
+        return [self._maybe_normalize(var_out) for var_out in var_outs]
+
     def relevant_transcripts(self, var_g):
         """return list of transcripts accessions (strings) for given variant,
         selected by genomic overlap"""
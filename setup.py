@@ -45,7 +45,6 @@ setup(license="Apache License 2.0 (http://www.apache.org/licenses/LICENSE-2.0)",
       ],
       install_requires=[
           "biocommons.seqrepo",
-          "biopython>=1.66",
           "bioutils>=0.2.0a2",
           "configparser>=3.3.0",
           "ipython",            # for hgvs-shell
@@ -54,6 +53,12 @@ setup(license="Apache License 2.0 (http://www.apache.org/licenses/LICENSE-2.0)",
           "recordtype>=1.1",
           "requests>=1.0.0",
       ],
+      extras_require={
+          # for the batch/array APIs: hgvs.variantbatch, hgvs.saturationtable,
+          # IntervalMapper.map_*_array, TranscriptMapper.*_many, and
+          # VariantMapper.g_to_c_batch
+          "batch": ["numpy"],
+      },
       setup_requires=[
           "setuptools_scm",
           "nose",
@@ -63,6 +68,7 @@ setup(license="Apache License 2.0 (http://www.apache.org/licenses/LICENSE-2.0)",
           "wheel",
       ],
       tests_require=[
+          "biopython>=1.66",    # to check hgvs.utils.translate
           "coverage",
           "unicodecsv",
       ], )
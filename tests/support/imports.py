@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# Import hgvs modules in a fresh interpreter, for tests/test_hgvs_imports.py
+# and tests/bin/import-time-benchmark
+
+import json
+import os
+import subprocess
+import sys
+
+# packages that must not be imported until they are used
+heavy_packages = ["Bio", "IPython", "multiprocessing", "numpy", "psycopg2", "requests"]
+
+_import_script = """
+import json, sys, time
+t0 = time.time()
+import {module}
+t1 = time.time()
+print(json.dumps({{"seconds": t1 - t0, "packages": sorted(set(m.split(".")[0] for m, v in sys.modules.items() if v is not None))}}))
+"""
+
+_repo_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def import_in_subprocess(module):
+    """import module in a fresh interpreter; return the import time and
+    the set of top-level packages loaded"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([_repo_dir] + [p for p in [env.get("PYTHONPATH")] if p])
+    out = subprocess.check_output([sys.executable, "-W", "ignore", "-c", _import_script.format(module=module)],
+                                  env=env, cwd=_repo_dir)
+    result = json.loads(out.decode("utf-8").strip().splitlines()[-1])
+    return result["seconds"], set(result["packages"])
+
+# <LICENSE>
+# Copyright 2013-2015 HGVS Contributors (https://bitbucket.org/biocommons/hgvs)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# </LICENSE>
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import random
+import unittest
+
+from nose.plugins.attrib import attr
+
+from hgvs.dataproviders.seqcache import SeqCache
+
+seqs = {
+    "NC_000001.10": "".join(random.Random(1).choice("ACGT") for _ in range(5000)),
+    "NM_000001.1": "".join(random.Random(2).choice("ACGT") for _ in range(700)),
+}
+
+
+class Fetcher(object):
+    def __init__(self):
+        self.requests = []
+
+    def __call__(self, ac, start_i=None, end_i=None):
+        self.requests.append((ac, start_i, end_i))
+        seq = seqs[ac]
+        return seq if (start_i is None or end_i is None) else seq[start_i:end_i]
+
+
+@attr(tags=["quick"])
+class Test_SeqCache(unittest.TestCase):
+    def test_slices(self):
+        fetch = Fetcher()
+        sc = SeqCache(fetch, block_size=256, max_bytes=100000)
+        rng = random.Random(3)
+        for _ in range(500):
+            ac = rng.choice(sorted(seqs))
+            start_i = rng.randrange(0, len(seqs[ac]))
+            end_i = start_i + rng.randrange(0, 600)
+            self.assertEqual(seqs[ac][start_i:end_i], sc.get_seq(ac, start_i, end_i))
+        self.assertEqual(seqs["NM_000001.1"], sc.get_seq("NM_000001.1"))
+        # every block of the genomic sequence, and the transcript, were fetched once
+        self.assertEqual(sorted(set(fetch.requests)), sorted(fetch.requests))
+        self.assertTrue(all(r[1] % 256 == 0 and r[2] - r[1] == 256 for r in fetch.requests if r[0] == "NC_000001.10"))
+        self.assertEqual([("NM_000001.1", None, None)], [r for r in fetch.requests if r[0] == "NM_000001.1"])
+        info = sc.cache_info()
+        self.assertEqual(501, info.hits + info.misses)
+        self.assertGreater(info.hit_ratio, 0.9)
+
+    def test_whole_genomic_sequence(self):
+        fetch = Fetcher()
+        sc = SeqCache(fetch, block_size=256, max_bytes=100000)
+        self.assertEqual(seqs["NC_000001.10"], sc.get_seq("NC_000001.10"))
+        self.assertEqual(seqs["NC_000001.10"][1000:1010], sc.get_seq("NC_000001.10", 1000, 1010))
+        self.assertEqual([("NC_000001.10", None, None)], fetch.requests)
+
+    def test_one_ended_genomic_request(self):
+        fetch = Fetcher()
+        sc = SeqCache(fetch, block_size=256, max_bytes=100000)
+        sc.get_seq("NC_000001.10", 4900, None)
+        sc.get_seq("NC_000001.10", None, 100)
+        self.assertEqual([("NC_000001.10", 4900, None), ("NC_000001.10", None, 100)], fetch.requests)
+        self.assertEqual((0, 2, 100000, 0), tuple(sc.cache_info()))
+
+    def test_eviction(self):
+        fetch = Fetcher()
+        sc = SeqCache(fetch, block_size=100, max_bytes=300)
+        for start_i in range(0, 1000, 100):
+            sc.get_seq("NC_000001.10", start_i, start_i + 10)
+            self.assertLessEqual(sc.cache_info().currbytes, 300)
+        sc.get_seq("NC_000001.10", 950, 960)    # cached
+        sc.get_seq("NC_000001.10", 0, 10)    # evicted
+        self.assertEqual(11, len(fetch.requests))
+        self.assertEqual((1, 11), sc.cache_info()[:2])
+        sc.cache_clear()
+        self.assertEqual((0, 0, 300, 0), tuple(sc.cache_info()))
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+# <LICENSE>
+# Copyright 2013-2015 HGVS Contributors (https://bitbucket.org/biocommons/hgvs)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# </LICENSE>
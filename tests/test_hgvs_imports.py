@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import unittest
+
+from nose.plugins.attrib import attr
+
+from support.imports import heavy_packages, import_in_subprocess
+
+# generous wall-clock budget (seconds) for importing a module in a
+# fresh interpreter; about 0.15 s is typical
+import_time_budget = 1.0
+
+
+@attr(tags=["quick"])
+class Test_Imports(unittest.TestCase):
+    def _test_module(self, module):
+        seconds, packages = import_in_subprocess(module)
+        self.assertEqual([], sorted(packages.intersection(heavy_packages)))
+        self.assertLess(seconds, import_time_budget)
+
+    def test_hgvs(self):
+        self._test_module("hgvs")
+
+    def test_hgvs_parser(self):
+        self._test_module("hgvs.parser")
+
+    def test_hgvs_variantmapper(self):
+        self._test_module("hgvs.variantmapper")
+
+    def test_hgvs_dataproviders_uta(self):
+        self._test_module("hgvs.dataproviders.uta")
+
+    def test_hgvs_shell(self):
+        self._test_module("hgvs.shell")
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+# <LICENSE>
+# Copyright 2013-2015 HGVS Contributors (https://bitbucket.org/biocommons/hgvs)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# </LICENSE>
@@ -1,12 +1,14 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, division, print_function, unicode_literals
 
+import random
 import unittest
 
 from nose.plugins.attrib import attr
 
 import hgvs.exceptions
 import hgvs.intervalmapper
+import hgvs.utils
 
 
 @attr(tags=["quick"])
@@ -57,10 +59,98 @@ class Test_IntervalMapper(unittest.TestCase):
         with self.assertRaises(hgvs.exceptions.HGVSInvalidIntervalError):
             (s, e) = ivm.map_tgt_to_ref(0, 7)
 
+    def test_intervalmapper_matches_linear_search(self):
+        # bisection in _map must choose the same segments as a linear scan,
+        # including at indel boundaries and for exact and zero-width matches
+        rng = random.Random(0)
+        for _ in range(50):
+            cigar = "".join("{}{}".format(rng.randint(1, 5), rng.choice("=DIN")) for _ in range(rng.randint(1, 20)))
+            ivm = hgvs.intervalmapper.IntervalMapper.from_cigar(cigar)
+            for from_ivs, to_ivs, fn, from_len in [(ivm.ref_intervals, ivm.tgt_intervals, ivm.map_ref_to_tgt, ivm.ref_len),
+                                                    (ivm.tgt_intervals, ivm.ref_intervals, ivm.map_tgt_to_ref, ivm.tgt_len)]:
+                for start_i in range(-1, from_len + 2):
+                    for end_i in range(start_i, from_len + 2):
+                        for max_extent in [False, True]:
+                            try:
+                                expected = self._linear_map(from_ivs, to_ivs, start_i, end_i, max_extent)
+                            except hgvs.exceptions.HGVSInvalidIntervalError:
+                                with self.assertRaises(hgvs.exceptions.HGVSInvalidIntervalError):
+                                    fn(start_i, end_i, max_extent)
+                                continue
+                            self.assertEqual(expected, fn(start_i, end_i, max_extent),
+                                             (cigar, start_i, end_i, max_extent))
+
+    def test_intervalmapper_array_matches_scalar(self):
+        import numpy as np
+        rng = random.Random(0)
+        for _ in range(50):
+            cigar = "".join("{}{}".format(rng.randint(1, 5), rng.choice("=DIN")) for _ in range(rng.randint(1, 20)))
+            ivm = hgvs.intervalmapper.IntervalMapper.from_cigar(cigar)
+            for fn, fn_array, from_len in [(ivm.map_ref_to_tgt, ivm.map_ref_to_tgt_array, ivm.ref_len),
+                                           (ivm.map_tgt_to_ref, ivm.map_tgt_to_ref_array, ivm.tgt_len)]:
+                ivs = [(s, e) for s in range(0, from_len + 1) for e in range(s, from_len + 1)]
+                starts, ends = np.array(ivs).T
+                for max_extent in [False, True]:
+                    expected = [fn(s, e, max_extent) for s, e in ivs]
+                    to_starts, to_ends = fn_array(starts, ends, max_extent)
+                    self.assertEqual(expected, list(zip(to_starts.tolist(), to_ends.tolist())))
+            for start_i, end_i in [(-1, 0), (0, ivm.ref_len + 1)]:
+                with self.assertRaises(hgvs.exceptions.HGVSInvalidIntervalError):
+                    ivm.map_ref_to_tgt_array([0, start_i], [0, end_i])
+
+    def test_intervalmapper_array_empty(self):
+        ivm = hgvs.intervalmapper.IntervalMapper([])
+        with self.assertRaises(hgvs.exceptions.HGVSInvalidIntervalError):
+            ivm.map_ref_to_tgt(0, 1)
+        with self.assertRaises(hgvs.exceptions.HGVSInvalidIntervalError):
+            ivm.map_ref_to_tgt_array([0], [1])
+        with self.assertRaises(hgvs.exceptions.HGVSInvalidIntervalError):
+            ivm.map_tgt_to_ref_array([0], [1])
+
+    def test_intervalmapper_from_tx_exons(self):
+        rng = random.Random(0)
+        for _ in range(50):
+            exons = []
+            alt_pos = tx_pos = 0
+            for i in range(rng.randint(1, 10)):
+                cigar = "".join("{}{}".format(rng.randint(1, 50), rng.choice("==DIX")) for _ in range(rng.randint(1, 4)))
+                im = hgvs.intervalmapper.IntervalMapper.from_cigar(cigar)
+                alt_pos += rng.choice([0, rng.randint(1, 1000)])
+                exons.append({"ord": i, "cigar": cigar, "alt_start_i": alt_pos, "alt_end_i": alt_pos + im.ref_len,
+                              "tx_start_i": tx_pos, "tx_end_i": tx_pos + im.tgt_len})
+                alt_pos += im.ref_len
+                tx_pos += im.tgt_len
+            for strand in [1, -1]:
+                ivm = hgvs.intervalmapper.IntervalMapper.from_tx_exons(exons, strand)
+                expected = hgvs.intervalmapper.IntervalMapper.from_cigar(hgvs.utils.build_tx_cigar(exons, strand))
+                self.assertEqual(repr(expected.interval_pairs), repr(ivm.interval_pairs))
+                self.assertEqual((expected.ref_len, expected.tgt_len), (ivm.ref_len, ivm.tgt_len))
+                self.assertEqual(expected.map_ref_to_tgt(0, ivm.ref_len), ivm.map_ref_to_tgt(0, ivm.ref_len))
+
     #
     # internal methods
     #
 
+    @staticmethod
+    def _linear_map(from_ivs, to_ivs, from_start_i, from_end_i, max_extent):
+        """the original linear-scan implementation of IntervalMapper._map"""
+        seil = [i for i, iv in enumerate(from_ivs) if iv.start_i == from_start_i and iv.end_i == from_end_i]
+        if len(seil) > 0:
+            si = ei = seil[0]
+        else:
+            sil = [i for i, iv in enumerate(from_ivs) if iv.start_i <= from_start_i <= iv.end_i]
+            eil = [i for i, iv in enumerate(from_ivs) if iv.start_i <= from_end_i <= iv.end_i]
+            if len(sil) == 0 or len(eil) == 0:
+                raise hgvs.exceptions.HGVSInvalidIntervalError()
+            si, ei = (sil[0], eil[-1]) if max_extent else (sil[-1], eil[0])
+
+        def clip_to_iv(iv, pos):
+            return max(iv.start_i, min(iv.end_i, pos))
+
+        to_start_i = clip_to_iv(to_ivs[si], to_ivs[si].start_i + (from_start_i - from_ivs[si].start_i))
+        to_end_i = clip_to_iv(to_ivs[ei], to_ivs[ei].end_i - (from_ivs[ei].end_i - from_end_i))
+        return to_start_i, to_end_i
+
     def _check_valid_intervalpair(self, s1, e1, s2, e2):
         iv1 = hgvs.intervalmapper.Interval(s1, e1)
         iv2 = hgvs.intervalmapper.Interval(s2, e2)
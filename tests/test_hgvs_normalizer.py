@@ -14,6 +14,20 @@ import hgvs.normalizer
 hdp = hgvs.dataproviders.uta.connect(mode="run", cache="tests/data/cache.hdp")
 
 
+class WholeSequenceDataProvider(object):
+    """serves get_seq slices from whole sequences, so that any slice
+    of a sequence that is in the test cache is available"""
+
+    def __init__(self, hdp):
+        self._hdp = hdp
+
+    def get_seq(self, ac, start_i=None, end_i=None):
+        return self._hdp.get_seq(ac)[start_i:end_i]
+
+    def __getattr__(self, name):
+        return getattr(self._hdp, name)
+
+
 @attr(tags=["normalization"])
 class Test_HGVSNormalizer(unittest.TestCase):
     """Tests for normalizer"""
@@ -149,6 +163,22 @@ class Test_HGVSNormalizer(unittest.TestCase):
         with self.assertRaises(HGVSInvalidVariantError):
             self.norm.normalize(self.hp.parse_hgvs_variant("NG_032871.1:g.32476_53457delinsAATTAAGGTATA"))
 
+    def test_normalize_both(self):
+        """Test normalization in both directions"""
+        whole_hdp = WholeSequenceDataProvider(hdp)
+        for cross_boundaries in (True, False):
+            norm = hgvs.normalizer.Normalizer(whole_hdp, shuffle_direction=3, cross_boundaries=cross_boundaries)
+            norm5 = hgvs.normalizer.Normalizer(whole_hdp, shuffle_direction=5, cross_boundaries=cross_boundaries)
+            variants = [self.hp.parse_hgvs_variant("NM_000051.3:" + s) for s in [
+                "c.14_15insT", "c.-5_-4insA", "c.-4_-3insAC", "c.-2_-1insCA", "c.1_2insCA", "c.*2_*3insT",
+                "c.9170_9171insAT", "c.7_8del", "c.30_31dup", "c.100_105delinsTT", "c.50_53inv"]]
+            self.assertEqual([(norm.normalize(var), norm5.normalize(var)) for var in variants],
+                             norm.normalize_both_many(variants))
+
+        var_3, var_5 = norm.normalize_both(self.hp.parse_hgvs_variant("NM_000051.3:c.14_15insT"))
+        self.assertEqual("NM_000051.3:c.15dupT", str(var_3))
+        self.assertEqual("NM_000051.3:c.14dupT", str(var_5))
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -1,13 +1,18 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, division, print_function, unicode_literals
 
+import gzip
+import itertools
 import os
 import pprint
+import random
+import shutil
+import tempfile
 import unittest
 
 from nose.plugins.attrib import attr
 
-from hgvs.exceptions import HGVSParseError
+from hgvs.exceptions import HGVSParseError, HGVSUsageError
 import hgvs.parser
 
 
@@ -53,6 +58,197 @@ class Test_Position(unittest.TestCase):
         #self.assertEqual( str(self.parser.parse_p_posedit("=?")), "(=)" )
         self.assertEqual(str(self.parser.parse_p_posedit("(=)")), "(=)")
 
+    @attr(tags=["quick"])
+    def test_parser_shares_grammar(self):
+        self.assertIs(hgvs.parser.Parser()._grammar, self.parser._grammar)
+
+    @attr(tags=["quick"])
+    def test_compile_grammar(self):
+        cache_dir = tempfile.mkdtemp()
+        try:
+            mod_path = hgvs.parser.compile_grammar(cache_dir=cache_dir)
+            self.assertTrue(os.path.exists(mod_path))
+            self.assertTrue(os.path.basename(mod_path).startswith("hgvs_grammar_"))
+            mtime = os.path.getmtime(mod_path)
+            self.assertEqual(mod_path, hgvs.parser.compile_grammar(cache_dir=cache_dir))
+            self.assertEqual(mtime, os.path.getmtime(mod_path))
+        finally:
+            shutil.rmtree(cache_dir)
+
+
+@attr(tags=["quick"])
+class Test_ParseCache(unittest.TestCase):
+    def test_cache_disabled(self):
+        parser = hgvs.parser.Parser()
+        self.assertIsNone(parser.cache_info())
+
+    def test_cache_copies(self):
+        parser = hgvs.parser.Parser(cache_size=2)
+        v1 = parser.parse_hgvs_variant("NM_01234.5:c.22+1A>T")
+        v1.posedit.edit.alt = "G"
+        v2 = parser.parse_hgvs_variant("NM_01234.5:c.22+1A>T")
+        self.assertIsNot(v1, v2)
+        self.assertEqual("NM_01234.5:c.22+1A>T", str(v2))
+        self.assertEqual((1, 1, 2, 1), tuple(parser.cache_info()))
+
+    def test_cache_shared(self):
+        parser = hgvs.parser.Parser(cache_size=2, cache_shared=True)
+        v1 = parser.parse_hgvs_variant("NM_01234.5:c.22+1A>T")
+        self.assertIs(v1, parser.parse_hgvs_variant("NM_01234.5:c.22+1A>T"))
+
+    def test_cache_bounded(self):
+        parser = hgvs.parser.Parser(cache_size=2, fast=True)
+        for s in ["NC_000001.10:g.1A>T", "NC_000001.10:g.2A>T", "NC_000001.10:g.3A>T", "NC_000001.10:g.1A>T"]:
+            parser.parse_hgvs_variant(s)
+        self.assertEqual((0, 4, 2, 2), tuple(parser.cache_info()))
+        parser.cache_clear()
+        self.assertEqual((0, 0, 2, 0), tuple(parser.cache_info()))
+
+    def test_cache_errors_not_cached(self):
+        parser = hgvs.parser.Parser(cache_size=2)
+        for _ in range(2):
+            with self.assertRaises(HGVSParseError):
+                parser.parse_hgvs_variant("NM_01234.5:c.22+1A>")
+        self.assertEqual(0, parser.cache_info().currsize)
+
+
+class Test_ParseMany(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.parser = hgvs.parser.Parser()
+        fn = os.path.join(os.path.dirname(__file__), "data", "gauntlet")
+        variants = [l.strip() for l in open(fn, "r") if not l.startswith("#") and l.strip()]
+        fn = os.path.join(os.path.dirname(__file__), "data", "reject")
+        rejects = [l.split("\t")[0] for l in open(fn, "r") if not l.startswith("#") and l.strip()]
+        cls.inputs = variants + rejects
+        random.Random(0).shuffle(cls.inputs)
+
+    def _check(self, results):
+        self.assertEqual(len(self.inputs), len(results))
+        for s, r in zip(self.inputs, results):
+            try:
+                self.assertEqual(repr(self.parser.parse_hgvs_variant(s)), repr(r))
+            except HGVSParseError as exc:
+                self.assertIsInstance(r, HGVSParseError)
+                self.assertEqual(str(exc), str(r))
+                self.assertEqual((s, exc.position, exc.reason), (r.s, r.position, r.reason))
+
+    @attr(tags=["quick"])
+    def test_parse_many_in_process(self):
+        self._check(list(self.parser.parse_many(self.inputs, processes=1)))
+
+    def test_parse_many_pool(self):
+        self._check(list(self.parser.parse_many(iter(self.inputs), processes=2, chunksize=7)))
+
+    def test_parse_many_streams(self):
+        # an unbounded input must not be consumed eagerly
+        results = self.parser.parse_many(itertools.cycle(self.inputs[:3]), processes=2, chunksize=5)
+        self.assertEqual(10, len(list(itertools.islice(results, 10))))
+        results.close()
+
+
+class Test_Check(unittest.TestCase):
+    """check must agree with parse_hgvs_variant"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.parser = hgvs.parser.Parser()
+        cls.fast_parser = hgvs.parser.Parser(fast=True)
+
+    def _compare(self, s):
+        try:
+            expected = self.parser.parse_hgvs_variant(s).type
+        except HGVSParseError:
+            expected = None
+        self.assertEqual(expected, self.parser.check(s), s)
+        self.assertEqual(expected, self.fast_parser.check(s), s)
+
+    @attr(tags=["quick"])
+    def test_check(self):
+        for s in Test_FastParse.edge_cases:
+            self._compare(s)
+
+    def test_check_gauntlet_and_reject(self):
+        for name in ["gauntlet", "reject"]:
+            fn = os.path.join(os.path.dirname(__file__), "data", name)
+            for line in open(fn, "r"):
+                if line.startswith("#") or line.strip() == "":
+                    continue
+                self._compare(line.rstrip("\n").split("\t")[0])
+
+    @attr(tags=["quick"])
+    def test_check_many(self):
+        results = list(self.parser.check_many(["NM_01234.5:c.22+1A>T", "NM_01234.5:c.22+1A>", "NM_01234.5 c.22A>T"]))
+        self.assertEqual(["c", None, None], results)
+
+
+class Test_FastParse(unittest.TestCase):
+    """fast parsing must give results identical to the grammar"""
+
+    edge_cases = [
+        "NM_01234.5:c.*5_*10del", "NM_01234.5:c.*5_6del", "NM_01234.5:c.-5-3A>G", "NM_01234.5:c.+5A>G",
+        "NM_01234.5:c.5+3_6-2delinsAT", "NM_01234.5:c.5delins", "NM_01234.5:c.-5_-3dup", "NM_01234.5:c.0A>T",
+        "NM_01234.5:n.*5A>T", "NM_01234.5:n.5-1_5+1delinsA", "NC_000001.10:g.5del12", "NC_000001.10:g.5del12AC",
+        "NC_000001.10:g.5delinsA", "NC_000001.10:g.5dup", "NC_000001.10:g.5_6insn", "NC_000001.10:g.5a>t",
+        "NC_000001.10:g.5A>T\n", "NC_000001.10:g.5A>U", "NC_000001.10:g.5A>TT", "NC_000001.10:g.5_6del2insAC",
+        "NC_000001.10:g.-5A>T", "NC_000001.10:g.5+1A>T", "NC_000001.10:g.(5_6)del", "NC_000001.10:g.5_6delins",
+        "LRG_1t1:c.5A>T", "N_1:g.5A>T", "NM:c.5A>T", "NM_1.1.1:c.5A>T", "c.5A>T", ":g.5A>T", "NM_1:c.", "",
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        cls.parser = hgvs.parser.Parser()
+        cls.fast_parser = hgvs.parser.Parser(fast=True)
+
+    def _compare(self, s):
+        try:
+            expected = self.parser.parse_hgvs_variant(s)
+        except HGVSParseError:
+            with self.assertRaises(HGVSParseError):
+                self.fast_parser.parse_hgvs_variant(s)
+            return
+        actual = self.fast_parser.parse_hgvs_variant(s)
+        self.assertEqual(repr(expected), repr(actual), s)
+        self.assertEqual(expected.posedit.pos.start is expected.posedit.pos.end,
+                         actual.posedit.pos.start is actual.posedit.pos.end, s)
+
+    @attr(tags=["quick"])
+    def test_edge_cases(self):
+        for s in self.edge_cases:
+            self._compare(s)
+
+    @attr(tags=["quick"])
+    def test_grammar_test_variants(self):
+        fn = os.path.join(os.path.dirname(__file__), "data", "grammar_test.tsv")
+        for line in open(fn, "r"):
+            row = line.rstrip("\n").split("\t")
+            if row[0] in ("hgvs_variant", "c_variant", "g_variant", "n_variant"):
+                for var in row[1].split("|"):
+                    self._compare(var)
+
+    def test_gauntlet(self):
+        fn = os.path.join(os.path.dirname(__file__), "data", "gauntlet")
+        for var in open(fn, "r"):
+            var = var.strip()
+            if var.startswith("#") or var == "":
+                continue
+            self._compare(var)
+
+    def test_clinvar(self):
+        fn = os.path.join(os.path.dirname(__file__), "data", "clinvar.gz")
+        with gzip.open(fn) as f:
+            next(f)
+            for line in f:
+                if line.startswith(b"#"):
+                    continue
+                for var in line.decode("utf-8").rstrip("\n").split("\t")[2].split():
+                    self._compare(var)
+
+    @attr(tags=["quick"])
+    def test_fast_requires_default_grammar(self):
+        with self.assertRaises(HGVSUsageError):
+            hgvs.parser.Parser(grammar_fn=__file__, fast=True)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -7,10 +7,15 @@ from nose.plugins.attrib import attr
 
 import hgvs.dataproviders.uta
 
+import hgvs.intervalmapper
 import hgvs.location
+import hgvs.normalizer
 import hgvs.parser
+import hgvs.projector
+import hgvs.validator
+import hgvs.variantmapper
 from hgvs.exceptions import HGVSError
-from hgvs.transcriptmapper import TranscriptMapper
+from hgvs.transcriptmapper import TranscriptMapper, TranscriptMapperRegistry
 
 
 @attr(tags=["quick"])
@@ -318,6 +323,61 @@ class Test_transcriptmapper(unittest.TestCase):
         ]
         self.run_cases(tm, test_cases)
 
+    def test_transcriptmapper_intervalmapper_from_tx_exons(self):
+        """the IntervalMapper built from exon records matches the one built from the CIGAR string"""
+        for tx_ac, alt_ac in [("NM_178434.2", "NC_000001.10"), ("NM_033445.2", "NC_000001.10"),
+                              ("NM_014357.4", "NC_000001.10"), ("NM_178449.3", "NC_000019.9")]:
+            tm = TranscriptMapper(self.hdp, tx_ac, alt_ac, alt_aln_method="splign")
+            im = hgvs.intervalmapper.IntervalMapper.from_cigar(tm.cigar)
+            for attr in ["ref_starts", "ref_ends", "tgt_starts", "tgt_ends", "ref_len", "tgt_len"]:
+                self.assertEqual(getattr(im, attr), getattr(tm.im, attr))
+            self.assertEqual(sorted(e["tx_start_i"] for e in tm.tx_exons) + [tm.tgt_len], tm.tx_exon_bounds)
+
+    def test_transcriptmapper_many(self):
+        """the batch methods match the scalar methods at every position near exon boundaries and a sample of others"""
+        import numpy as np
+        for tx_ac, alt_ac in [("NM_178434.2", "NC_000001.10"), ("NM_033445.2", "NC_000001.10"),
+                              ("NM_003777.3", "NC_000007.13"), ("NM_007294.3", "NC_000017.10")]:
+            tm = TranscriptMapper(self.hdp, tx_ac, alt_ac, alt_aln_method="splign")
+            g_first, g_last = tm.gc_offset + 1, tm.gc_offset + tm.im.ref_len
+            boundaries = np.array(tm.im.ref_starts) + tm.gc_offset
+            g_positions = np.unique(np.concatenate([np.arange(g_first, g_last + 1, 50)] +
+                                                   [np.clip(boundaries + d, g_first, g_last) for d in range(-3, 4)]))
+            c_bases, c_offsets, c_datums = tm.g_to_c_many(g_positions)
+            for g, c_base, c_offset, c_datum in zip(g_positions.tolist(), c_bases, c_offsets, c_datums):
+                g_interval = hgvs.location.Interval(hgvs.location.SimplePosition(g), hgvs.location.SimplePosition(g))
+                c_interval = tm.g_to_c(g_interval)
+                self.assertEqual((c_interval.start.base, c_interval.start.offset, c_interval.start.datum),
+                                 (c_base, c_offset, c_datum), (tx_ac, g))
+            self.assertEqual(g_positions.tolist(), tm.c_to_g_many(c_bases, c_offsets, c_datums).tolist())
+
+        with self.assertRaises(HGVSError):
+            tm.n_to_c_many([1, tm.tgt_len + 1])
+        with self.assertRaises(HGVSError):
+            tm.c_to_g_many([1, 0], [0, 0], [hgvs.location.CDS_START, hgvs.location.CDS_START])
+
+    def test_transcriptmapper_registry(self):
+        registry = TranscriptMapperRegistry.for_hdp(self.hdp)
+        self.assertIs(registry, hgvs.variantmapper.VariantMapper(self.hdp).tm_registry)
+        self.assertIs(registry, hgvs.normalizer.Normalizer(self.hdp, shuffle_direction=3,
+                                                           cross_boundaries=True).hm.tm_registry)
+        self.assertIs(registry, hgvs.validator.ExtrinsicValidator(self.hdp).vm.tm_registry)
+
+        registry.cache_clear()
+        tm = registry.get("NM_178434.2", "NC_000001.10", "splign")
+        pj = hgvs.projector.Projector(self.hdp, "NC_000001.10", "NM_178434.2", "NM_033445.2", "splign", "splign")
+        self.assertIs(tm, pj.src_tm)
+        self.assertEqual((1, 2, 2), registry.cache_info()[:2] + (registry.cache_info().currsize, ))
+
+        vm = hgvs.variantmapper.VariantMapper(self.hdp)
+        self.assertIs(registry, TranscriptMapperRegistry.for_hdp(self.hdp, maxsize=1))
+        self.assertIs(registry, vm.tm_registry)
+        self.assertEqual(1, registry.maxsize)
+        registry.get("NM_178434.2", "NC_000001.10", "splign")
+        registry.get("NM_033445.2", "NC_000001.10", "splign")
+        self.assertEqual((0, 2, 1, 1), tuple(registry.cache_info()))
+        registry.resize(hgvs.global_config.lru_cache.transcript_mapper_maxsize)
+
     def run_cases(self, tm, test_cases):
         for test_case in test_cases:
             self.assertEquals(tm.g_to_n(test_case["g"]), test_case["n"])
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import random
+import unittest
+
+from nose.plugins.attrib import attr
+
+from hgvs.utils.norm import normalize_alleles
+
+
+def shuffle_one_base(ref, start, stop, alleles, bound, left):
+    """shuffle an insertion or deletion one base at a time"""
+    allele = alleles[0] or alleles[1]
+    while True:
+        if left and start > bound and ref[start - 1].upper() == allele[-1]:
+            start, stop, allele = start - 1, stop - 1, ref[start - 1].upper() + allele[:-1]
+        elif not left and stop < bound and ref[stop].upper() == allele[0]:
+            start, stop, allele = start + 1, stop + 1, allele[1:] + ref[stop].upper()
+        else:
+            break
+    return start, stop, tuple("" if not a else allele for a in alleles)
+
+
+@attr(tags=["quick"])
+class Test_NormalizeAlleles(unittest.TestCase):
+    def test_repeats(self):
+        ref = "GGA" + "CT" * 10 + "GAG"
+        # deletion and insertion of CT in the middle of the repeat
+        self.assertEqual((21, 23, ("CT", "")), normalize_alleles(ref, 9, 11, ("CT", ""), len(ref), 4, False))
+        self.assertEqual((3, 5, ("CT", "")), normalize_alleles(ref, 9, 11, ("CT", ""), 0, 4, True))
+        self.assertEqual((23, 23, ("", "CT")), normalize_alleles(ref, 9, 9, ("", "CT"), len(ref), 4, False))
+        self.assertEqual((3, 3, ("", "CT")), normalize_alleles(ref, 9, 9, ("", "CT"), 0, 4, True))
+        # shuffling stops at the bound
+        self.assertEqual((15, 17, ("CT", "")), normalize_alleles(ref, 9, 11, ("CT", ""), 17, 4, False))
+        self.assertEqual((5, 7, ("CT", "")), normalize_alleles(ref, 9, 11, ("CT", ""), 5, 4, True))
+
+    def test_random_indels(self):
+        rng = random.Random(1)
+        for _ in range(2000):
+            unit = "".join(rng.choice("ACGT") for _ in range(rng.randint(1, 4)))
+            ref = ("".join(rng.choice("ACGT") for _ in range(10)) + unit * rng.randint(1, 50) +
+                   "".join(rng.choice("ACGT") for _ in range(10)))
+            start = rng.randint(1, len(ref) - len(unit))
+            if rng.random() < 0.5:
+                stop, alleles = start + len(unit), (ref[start:start + len(unit)], "")
+            else:
+                stop, alleles = start, ("", unit)
+            for left, bound in ((False, len(ref)), (False, rng.randint(stop, len(ref))), (True, 0),
+                                (True, rng.randint(0, start))):
+                self.assertEqual(
+                    shuffle_one_base(ref, start, stop, alleles, bound, left),
+                    tuple(normalize_alleles(ref, start, stop, alleles, bound, rng.randint(1, 20), left)))
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+# <LICENSE>
+# Copyright 2013-2015 HGVS Contributors (https://bitbucket.org/biocommons/hgvs)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# </LICENSE>
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import itertools
+import random
+import unittest
+
+from Bio.Seq import Seq
+from nose.plugins.attrib import attr
+
+from hgvs.exceptions import HGVSError
+from hgvs.utils.translate import translate_cds
+
+iupac_bases = "ACGTURYSWKMBDHVN"
+
+
+@attr(tags=["quick"])
+class Test_TranslateCds(unittest.TestCase):
+    def test_codons_match_biopython(self):
+        for codon in itertools.product(iupac_bases + iupac_bases.lower(), repeat=3):
+            codon = "".join(codon)
+            self.assertEqual(str(Seq(codon).translate()), translate_cds(codon), codon)
+
+    def test_sequences_match_biopython(self):
+        rng = random.Random(1)
+        for n in (0, 2, 3, 299, 300, 301, 1500):
+            seq = "".join(rng.choice("ACGT") for _ in range(n))
+            aa = str(Seq(seq[:n - n % 3]).translate())
+            self.assertEqual(aa, translate_cds(seq))
+            self.assertEqual(aa[:aa.find("*") + 1] if "*" in aa else aa, translate_cds(seq, to_stop=True))
+
+    def test_to_stop(self):
+        seq = "ATG" + "GCT" * 400 + "TGA" + "GCT" * 10 + "TAA"
+        self.assertEqual("M" + "A" * 400 + "*", translate_cds(seq, to_stop=True))
+        self.assertEqual("M" + "A" * 400 + "*" + "A" * 10 + "*", translate_cds(seq))
+        self.assertEqual("MA", translate_cds("ATGGCTG", to_stop=True))
+
+    def test_invalid(self):
+        for seq in ("ATGGA-", "XXX", "AT."):
+            with self.assertRaises(HGVSError):
+                translate_cds(seq)
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+# <LICENSE>
+# Copyright 2013-2015 HGVS Contributors (https://bitbucket.org/biocommons/hgvs)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# </LICENSE>
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, division, print_function, unicode_literals
 
+import copy
+import pickle
 import unittest
 
 from nose.plugins.attrib import attr
@@ -65,6 +67,73 @@ class Test_SequenceVariant(unittest.TestCase):
         self.assertEqual(var.format(conf), "NP_001628.1:p.G528*")
         self.assertEqual(var.format(), "NP_001628.1:p.Gly528Ter")
         
+    def test_slots(self):
+        # model objects carry no per-instance __dict__, and still copy and pickle
+        hp = hgvs.parser.Parser()
+        for hgvs_string in ["NC_000007.13:g.36561662C>T", "NM_001637.3:c.1582+3_1583-2del",
+                            "NM_001637.3:c.*5dupA", "NM_001637.3:c.1582_1583inv",
+                            "NC_000007.13:g.123_456conNG_012232.1:g.9456_10011", "NP_001628.1:p.Gly528Arg",
+                            "NP_001628.1:p.Arg97ProfsTer23", "NP_001628.1:p.Ter110GlnextTer17"]:
+            var = hp.parse_hgvs_variant(hgvs_string)
+            for obj in [var, var.posedit, var.posedit.pos, var.posedit.pos.start, var.posedit.edit]:
+                self.assertFalse(hasattr(obj, "__dict__"), "{}: {}".format(hgvs_string, type(obj).__name__))
+            self.assertEqual(var, copy.deepcopy(var))
+            self.assertEqual(var, pickle.loads(pickle.dumps(var)))
+            self.assertEqual(str(var), hgvs_string)
+
+    def test_clone(self):
+        hp = hgvs.parser.Parser()
+        for hgvs_string in ["NM_001637.3:c.1582+3_1583-2delinsAT", "NM_001637.3:c.*5dupA",
+                            "NC_000007.13:g.123_456conNG_012232.1:g.9456_10011", "NP_001628.1:p.Arg97ProfsTer23"]:
+            var = hp.parse_hgvs_variant(hgvs_string)
+            clone = var.clone()
+            self.assertEqual(var, clone)
+            self.assertEqual(type(var.posedit.edit), type(clone.posedit.edit))
+            self.assertIsNot(var.posedit, clone.posedit)
+            self.assertIsNot(var.posedit.pos.start, clone.posedit.pos.start)
+            self.assertIsNot(var.posedit.edit, clone.posedit.edit)
+            self.assertEqual(str(clone), hgvs_string)
+
+        # as with copy.deepcopy, a position used as start and end stays shared
+        var = hp.parse_hgvs_variant("NM_001637.3:c.1582G>A")
+        clone = var.clone()
+        self.assertIs(clone.posedit.pos.start, clone.posedit.pos.end)
+        clone.posedit.pos.start.base = 1583
+        self.assertEqual(str(var), "NM_001637.3:c.1582G>A")
+        self.assertEqual(str(clone), "NM_001637.3:c.1583G>A")
+
+    def test_freeze(self):
+        hp = hgvs.parser.Parser()
+        var1 = hp.parse_hgvs_variant("NM_001637.3:c.1582+3_1583-2delinsAT")
+        var2 = hp.parse_hgvs_variant("NM_001637.3:c.1582+3_1583-2delinsAT")
+        fv1, fv2 = var1.freeze(), var2.freeze()
+        self.assertEqual(fv1, fv2)
+        self.assertEqual(hash(fv1), hash(fv2))
+        self.assertEqual(1, len({fv1, fv2}))
+        self.assertEqual(("NM_001637.3", "c"), (fv1.ac, fv1.type))
+        self.assertEqual(str(fv1), "NM_001637.3:c.1582+3_1583-2delinsAT")
+
+        # thawed variants are equal but independent copies
+        tv = fv1.thaw()
+        self.assertEqual(var1, tv)
+        self.assertIsNot(var1.posedit, tv.posedit)
+        tv.posedit.edit.alt = "GC"
+        self.assertEqual(fv1, var1.freeze())
+
+        # later changes to the original do not affect the frozen variant
+        var2.posedit.edit.alt = "GC"
+        self.assertNotEqual(fv2, var2.freeze())
+        self.assertEqual(fv1, fv2)
+
+        # equality is structural, including the classes of components
+        self.assertNotEqual(hp.parse_hgvs_variant("NC_000007.13:g.5A>T").freeze(),
+                            hp.parse_hgvs_variant("NC_000007.13:n.5A>T").freeze())
+        self.assertNotEqual(hp.parse_hgvs_variant("NC_000007.13:g.5A>T").freeze(),
+                            hp.parse_hgvs_variant("NC_000007.13:g.(5)A>T").freeze())
+
+        self.assertEqual(fv1, pickle.loads(pickle.dumps(fv1)))
+        self.assertEqual(fv1, pickle.loads(pickle.dumps(fv1, 2)))
+
 
 
 if __name__ == "__main__":
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import gzip
+import os
+import unittest
+
+from nose.plugins.attrib import attr
+
+from hgvs.exceptions import HGVSInvalidVariantError, HGVSUnsupportedOperationError, HGVSUsageError
+import hgvs.dataproviders.uta
+import hgvs.parser
+import hgvs.variantbatch
+import hgvs.variantmapper
+from hgvs.variantbatch import VariantBatch
+
+
+def _read_g_variants():
+    """return the g. variants from the gauntlet and ClinVar test data"""
+    fn = os.path.join(os.path.dirname(__file__), "data", "gauntlet")
+    variants = [l.strip() for l in open(fn, "r") if not l.startswith("#") and ":g." in l]
+    fn = os.path.join(os.path.dirname(__file__), "data", "clinvar.gz")
+    with gzip.open(fn) as f:
+        next(f)
+        for line in f:
+            line = line.decode("utf-8")
+            if line.startswith("#"):
+                continue
+            variants += [v for v in line.rstrip("\n").split("\t")[2].split() if ":g." in v]
+    return variants
+
+
+@attr(tags=["quick"])
+class Test_VariantBatch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.hp = hgvs.parser.Parser(fast=True)
+        cls.variants = [cls.hp.parse_hgvs_variant(s) for s in _read_g_variants()]
+
+    def _check_batch(self, batch, variants):
+        self.assertEqual(len(variants), len(batch))
+        for i, var in enumerate(variants):
+            self.assertEqual(var, batch[i])
+            self.assertEqual(str(var), batch.format(i))
+            self.assertEqual(str(var), str(batch[i]))
+
+    def test_from_variants(self):
+        variants = []
+        for var in self.variants:
+            try:
+                hgvs.variantbatch.VariantBatch.from_variants([var])
+                variants.append(var)
+            except HGVSUnsupportedOperationError:
+                pass
+        self.assertGreater(len(variants), 0.9 * len(self.variants))
+        self._check_batch(VariantBatch.from_variants(variants), variants)
+
+    def test_from_strings(self):
+        strings = [str(v) for v in self.variants if "(" not in str(v) and "?" not in str(v)]
+        batch = VariantBatch.from_strings(strings)
+        self._check_batch(batch, [self.hp.parse_hgvs_variant(s) for s in strings])
+        self.assertEqual(strings, list(batch.formatted()))
+
+    def test_from_vcf(self):
+        rows = [
+            ("1", 100, "C", "T", "NC_000001.10:g.100C>T"),
+            ("1", 100, "C", "C", "NC_000001.10:g.100C="),
+            ("1", 100, "CAG", "C", "NC_000001.10:g.101_102delAG"),
+            ("1", 100, "C", "CAG", "NC_000001.10:g.100_101insAG"),
+            ("1", 100, "CAG", "CTT", "NC_000001.10:g.101_102delAGinsTT"),
+            ("1", 100, "CAGT", "CTTT", "NC_000001.10:g.101_102delAGinsTT"),
+            ("2", 100, "ca", "cg", "NC_000002.11:g.101A>G"),
+        ]
+        ac_map = {"1": "NC_000001.10", "2": "NC_000002.11"}
+        batch = VariantBatch.from_vcf(*zip(*rows)[:4], ac_map=ac_map)
+        self.assertEqual([r[4] for r in rows], list(batch.formatted()))
+        self.assertEqual([r[4] for r in rows], [str(v) for v in batch.variants()])
+        self.assertEqual(["NC_000001.10", "NC_000002.11"], batch.acs)
+
+        with self.assertRaises(HGVSUsageError):
+            VariantBatch.from_vcf(["3"], [100], ["C"], ["T"], ac_map=ac_map)
+        for alt in ["<DEL>", "*", ".", "T,G"]:
+            with self.assertRaises(HGVSUnsupportedOperationError):
+                VariantBatch.from_vcf(["1"], [100], ["C"], [alt])
+
+    def test_take(self):
+        batch = VariantBatch.from_strings(["NC_000001.10:g.100C>T", "NC_000002.11:g.5_6insAC",
+                                           "NC_000001.10:g.200_201dupCA", "NC_000001.10:g.300del"])
+        rows = batch.rows_for_ac("NC_000001.10")
+        self.assertEqual([0, 2, 3], list(rows))
+        self.assertEqual(["NC_000001.10:g.100C>T", "NC_000001.10:g.200_201dupCA", "NC_000001.10:g.300del"],
+                         list(batch.take(rows).formatted()))
+        self.assertEqual(0, len(batch.rows_for_ac("NC_000003.11")))
+
+    def test_g_to_c_batch(self):
+        hdp = hgvs.dataproviders.uta.connect(mode="run", cache="tests/data/cache.hdp")
+        vm = hgvs.variantmapper.VariantMapper(hdp)
+        for tx_ac, alt_ac in [("NM_003777.3", "NC_000007.13"), ("NM_007294.3", "NC_000017.10")]:
+            tm = vm._fetch_TranscriptMapper(tx_ac=tx_ac, alt_ac=alt_ac, alt_aln_method="splign")
+            g_first, g_last = tm.gc_offset + 1, tm.gc_offset + tm.im.ref_len
+            strings = ["NC_000001.10:g.100C>T"]
+            for g in range(g_first, g_last - 2, 997):
+                strings += ["{}:g.{}_{}del".format(alt_ac, g, g + 2), "{}:g.{}_{}insA".format(alt_ac, g, g + 1)]
+            batch = VariantBatch.from_strings(strings)
+            rows, starts, ends = vm.g_to_c_batch(batch, tx_ac, alt_ac)
+            self.assertEqual(list(range(1, len(strings))), rows.tolist())
+            for k, i in enumerate(rows.tolist()):
+                pos_c = vm.g_to_c(batch[i], tx_ac).posedit.pos
+                self.assertEqual((pos_c.start.base, pos_c.start.offset, pos_c.start.datum),
+                                 tuple(a[k] for a in starts), strings[i])
+                self.assertEqual((pos_c.end.base, pos_c.end.offset, pos_c.end.datum),
+                                 tuple(a[k] for a in ends), strings[i])
+
+        with self.assertRaises(HGVSInvalidVariantError):
+            vm.g_to_c_batch(VariantBatch.from_strings(["NC_012920.1:m.100C>T"]), "NM_003777.3", "NC_012920.1")
+
+    def test_negative_index(self):
+        strings = ["NC_000001.10:g.100C>T", "NC_000001.10:g.20G>A"]
+        batch = VariantBatch.from_strings(strings)
+        self.assertEqual(strings[1], batch.format(-1))
+        self.assertEqual(strings[1], str(batch[-1]))
+        self.assertEqual(strings[0], batch.format(-2))
+        self.assertEqual("A", batch.alt(-1))
+        for i in [2, -3]:
+            with self.assertRaises(IndexError):
+                batch[i]
+            with self.assertRaises(IndexError):
+                batch.format(i)
+
+    def test_subclass(self):
+        class SubBatch(VariantBatch):
+            pass
+
+        strings = ["NC_000001.10:g.100C>T", "NC_000001.10:g.200_201dupCA"]
+        variants = list(VariantBatch.from_strings(strings).variants())
+        for batch in [SubBatch.from_strings(strings), SubBatch.from_variants(variants),
+                      SubBatch.from_vcf(["NC_000001.10"], [100], ["C"], ["T"])]:
+            self.assertIs(SubBatch, type(batch))
+            self.assertIs(SubBatch, type(batch.take([0])))
+
+    def test_unsupported(self):
+        with self.assertRaises(HGVSUnsupportedOperationError):
+            VariantBatch.from_strings(["NM_001637.3:c.1582G>A"])
+        with self.assertRaises(HGVSUnsupportedOperationError):
+            VariantBatch.from_strings(["NC_000001.10:g.(100_110)del"])
+        with self.assertRaises(HGVSUsageError):
+            VariantBatch.from_strings(["NC_000001.10:g.100C>T", "NC_012920.1:m.100C>T"])
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+# <LICENSE>
+# Copyright 2013-2015 HGVS Contributors (https://bitbucket.org/biocommons/hgvs)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# </LICENSE>
@@ -8,6 +8,7 @@ from Bio.Seq import Seq
 import recordtype
 
 import hgvs.parser
+import hgvs.variantmapper
 import hgvs.utils.altseqbuilder as altseqbuilder
 
 import support.mock_input_source as mock_input_data_source
@@ -102,6 +103,29 @@ class TestAltSeqBuilder(unittest.TestCase):
         expected_sequence = ""
         self._run_comparison(hgvsc, expected_sequence)
 
+    def test_windowed_translation(self):
+        # every edit type at every cds position must translate as a full translation would
+        for ac, data in sorted(self._datasource._mock_data.items()):
+            transcript_data = hgvs.variantmapper.RefTranscriptData.setup_transcript_data(self._datasource, ac, "DUMMY")
+            cds = data["transcript_sequence"][data["cds_start_i"]:data["cds_end_i"]]
+            for i in range(len(cds)):
+                pos = i + 1
+                edits = ["{}{}>{}".format(pos, cds[i], alt) for alt in "ACGT" if alt != cds[i]]
+                edits += ["{}_{}ins{}".format(pos, pos + 1, alt) for alt in ("G", "TAA", "CCGATG")]
+                for n in (1, 3, 6):
+                    if i + n <= len(cds):
+                        interval = "{}_{}".format(pos, pos + n - 1)
+                        edits += [interval + "del" + cds[i:i + n], interval + "dup" + cds[i:i + n],
+                                  interval + "del" + cds[i:i + n] + "insGGT"]
+                for edit in edits:
+                    var = self._parser.parse_hgvs_variant("{}:c.{}".format(ac, edit))
+                    alt_data = altseqbuilder.AltSeqBuilder(var, transcript_data).build_altseq()[0]
+                    expected = altseqbuilder.AltTranscriptData.create_for_variant_inserter(
+                        alt_data.transcript_sequence, alt_data.cds_start, alt_data.cds_stop, alt_data.is_frameshift,
+                        alt_data.variant_start_aa, alt_data.protein_accession, alt_data.is_substitution,
+                        alt_data.is_ambiguous)
+                    self.assertEqual(expected.aa_sequence, alt_data.aa_sequence, str(var))
+
     # def test_2_substitutions(self):
     #     pass
     #
@@ -241,6 +241,37 @@ class TestHgvsCToP(unittest.TestCase):
     # def test_two_changes_unknown_allele(self):
     #     pass
 
+    def test_c_to_p_many(self):
+        hgvscs = ["NM_999999.1:c.6A>G", "NM_999996.1:c.8C>A", "NM_999999.1:c.6_7insGGG", "NM_999998.1:c.30G>T",
+                  "NM_999999.1:c.10_12del", "NM_999996.1:c.8C>A"]
+        var_cs = [TestHgvsCToP._parser.parse_hgvs_variant(hgvsc) for hgvsc in hgvscs]
+        mapper = variantmapper.VariantMapper(self._datasource)
+        var_ps = mapper.c_to_p_many(var_cs, "MOCK")
+        self.assertEqual([str(mapper.c_to_p(var_c, "MOCK")) for var_c in var_cs], [str(var_p) for var_p in var_ps])
+        self.assertEqual(["MOCK:p.(Lys2=)", "MOCK:p.(Ser3Ter)"], [str(var_p) for var_p in var_ps[:2]])
+        # reference data was built once per transcript
+        self.assertEqual(3, mapper._fetch_RefTranscriptData.cache_info().misses)
+
+    def test_saturation_table(self):
+        import hgvs.saturationtable as st
+        mapper = variantmapper.VariantMapper(self._datasource)
+        for ac in sorted(self._datasource._mock_data):
+            table = mapper.saturation_table(ac, "MOCK")
+            for pos in range(1, len(table) + 1):
+                ref = table.cds[pos - 1]
+                for alt in "ACGT":
+                    if alt == ref:
+                        self.assertEqual(st.NO_CHANGE, table.consequence(pos, alt))
+                        continue
+                    var_c = TestHgvsCToP._parser.parse_hgvs_variant("{}:c.{}{}>{}".format(ac, pos, ref, alt))
+                    var_p = mapper.c_to_p(var_c, "MOCK")
+                    self.assertEqual(var_p, table.lookup(pos, alt))
+                    self.assertEqual(str(var_p), str(table.lookup(pos, alt)))
+        table = mapper.saturation_table("NM_999999.1", "MOCK")
+        self.assertEqual([st.START_LOSS, st.MISSENSE, st.SYNONYMOUS, st.NONSENSE, st.STOP_LOSS],
+                         [table.consequence(pos, alt) for pos, alt in [(1, "T"), (4, "G"), (6, "G"), (4, "T"),
+                                                                       (28, "C")]])
+
     def _run_conversion(self, hgvsc, hgvsp_expected):
         """Helper method to actually run the test
         :param hgvsc tag